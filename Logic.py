@@ -1,9 +1,67 @@
+from array import array
+import bisect
 import heapq
 from collections import Counter
-import math
+import re
+import struct
+from collections import deque, OrderedDict
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import codecs
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python paths cover everything
+    np = None
+
+# Packed bitstreams end with the number of valid bits as a big-endian uint64
+BIT_LENGTH_TRAILER = struct.Struct('>Q')
+# Number of symbols (or bytes) converted per step when packing/unpacking
+PACK_CHUNK_SIZE = 1 << 16
+# Bits indexed per lookup by the table-driven decoder
+DECODE_TABLE_BITS = 12
+# Streaming containers: magic, per-block (type, body length) header, block size in characters
+CONTAINER_MAGIC = b'HRC1'
+BYTES_CONTAINER_MAGIC = b'HRB1'  # Same layout over a 256-symbol byte alphabet
+BLOCK_HEADER = struct.Struct('>BI')
+BLOCK_END = 0
+BLOCK_HUFFMAN = 1
+BLOCK_HUFFMAN_RLE = 2
+BLOCK_RAW = 3
+BLOCK_NAMES = {BLOCK_HUFFMAN: 'huffman_blocks', BLOCK_HUFFMAN_RLE: 'huffman_rle_blocks', BLOCK_RAW: 'raw_blocks'}
+DEFAULT_BLOCK_SIZE = 1 << 20
+# Seekable containers end with (offset of the end block, magic); the block index is the end block's body
+INDEX_FOOTER = struct.Struct('>Q4s')
+INDEX_MAGIC = b'HRIX'
+# RLE implementation used when no backend is passed: 'numpy' or 'python'
+RLE_BACKEND = 'numpy' if np is not None else 'python'
+RUN_PATTERN = re.compile('0+|1+')
+# Shared codebooks: file magic, length of the ID that prefixes every message, code length cap
+SHARED_CODEBOOK_MAGIC = b'HCB1'
+CODEBOOK_ID_SIZE = 8
+SHARED_MAX_CODE_LENGTH = 16
+# Adaptive streams: magic, and the literal sent after the NYT code (a byte, or end of stream)
+ADAPTIVE_MAGIC = b'HRA1'
+ADAPTIVE_EOF = 256
+ADAPTIVE_LITERAL_BITS = 9
+# Memory ceiling of a ResultCache, in pickled bytes
+DEFAULT_CACHE_BYTES = 64 << 20
+# Tree views: most nodes drawn, and the smallest share of the input a subtree needs to be expanded
+TREE_VIEW_NODES = 63
+TREE_VIEW_MIN_WEIGHT = 1 / 256
 
 # Define the Huffman Node class
 class HuffmanNode:
+    __slots__ = ('char', 'freq', 'left', 'right')
+
     def __init__(self, char, freq):
         self.char = char
         self.freq = freq
@@ -13,12 +71,79 @@ class HuffmanNode:
     def __lt__(self, other):
         return self.freq < other.freq
 
+# Per-stage metrics. Each stage accumulates its call count, wall-clock time
+# (perf_counter_ns) and bytes in/out; `counts` sums values such as RLE runs
+# and `maxima` keeps values such as the alphabet size. If a callback is
+# given it is called as callback(stage, record) as soon as a stage finishes,
+# so a front-end can show where a long job currently is.
+class CompressionStats:
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stages = {}
+        self.counts = {}
+        self.maxima = {}
+
+    @contextmanager
+    def stage(self, name, bytes_in=0):
+        record = {'ns': 0, 'bytes_in': bytes_in, 'bytes_out': 0}
+        start = time.perf_counter_ns()
+        yield record
+        record['ns'] = time.perf_counter_ns() - start
+        self.add_stage(name, record)
+
+    def add_stage(self, name, record, calls=1):
+        total = self.stages.setdefault(name, {'calls': 0, 'ns': 0, 'bytes_in': 0, 'bytes_out': 0})
+        total['calls'] += calls
+        for key in ('ns', 'bytes_in', 'bytes_out'):
+            total[key] += record[key]
+        if self.callback is not None:
+            self.callback(name, record)
+
+    def add(self, name, amount):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def maximum(self, name, value):
+        self.maxima[name] = max(self.maxima.get(name, value), value)
+
+    # Fold in stats collected elsewhere, e.g. by a worker process
+    def merge(self, other):
+        for name, total in other.stages.items():
+            self.add_stage(name, total, total['calls'])
+        for name, amount in other.counts.items():
+            self.add(name, amount)
+        for name, value in other.maxima.items():
+            self.maximum(name, value)
+
+    def as_rows(self):
+        return [{'stage': name, 'calls': total['calls'], 'ms': total['ns'] / 1e6,
+                 'bytes_in': total['bytes_in'], 'bytes_out': total['bytes_out'],
+                 'mb_per_s': total['bytes_in'] / total['ns'] * 1e3 if total['ns'] else None}
+                for name, total in self.stages.items()]
+
+    def summary(self):
+        lines = [f"{row['stage']}: {row['ms']:.3f} ms over {row['calls']} call(s), "
+                 f"{row['bytes_in']} B in, {row['bytes_out']} B out" for row in self.as_rows()]
+        lines += [f"{name}: {value}" for name, value in {**self.maxima, **self.counts}.items()]
+        return '\n'.join(lines)
+
+# Raised by a progress callback to stop a compression that is under way
+class CompressionCancelled(Exception):
+    pass
+
 # Step 1: Build Huffman Tree
 def build_huffman_tree(text):
     freq = Counter(text)
     heap = [HuffmanNode(char, freq) for char, freq in freq.items()]
     heapq.heapify(heap)
 
+    if not heap:
+        return None
+    if len(heap) == 1:
+        # A lone symbol still needs a one-bit code, so give it a parent
+        root = HuffmanNode(None, heap[0].freq)
+        root.left = heap[0]
+        return root
+
     while len(heap) > 1:
         left = heapq.heappop(heap)
         right = heapq.heappop(heap)
@@ -29,10 +154,69 @@ def build_huffman_tree(text):
 
     return heap[0]
 
+# Step 1b: Linear-Time Huffman Tree
+# Histogram in C: np.bincount (or bytes.count over the 256 byte values) for
+# bytes and ASCII text, Counter for any other text
+def symbol_frequencies(text):
+    if isinstance(text, str):
+        if not text.isascii():
+            return Counter(text)
+        text = text.encode('ascii')
+        symbol = chr
+    else:
+        symbol = int
+    try:
+        view = memoryview(text)  # bytes, bytearray, mmap and open_input's memoryview alike
+    except TypeError:  # Not a buffer, e.g. a list of symbols
+        return Counter(text)
+    # Views are released on the way out, so open_input can still close its mmap
+    with view, view.cast('B') as data:
+        if np is not None:
+            counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256).tolist()
+        else:
+            data = bytes(data)
+            counts = [data.count(value) for value in range(256)]
+    return {symbol(value): count for value, count in enumerate(counts) if count}
+
+# Two-queue construction: the leaves are sorted once by (frequency, symbol)
+# and merged nodes come out in non-decreasing frequency, so the two smallest
+# nodes are always at the front of one of the queues and each merge is O(1).
+# Ties go to the leaf, so the same histogram always gives the same tree.
+# Accepts text, bytes or a {symbol: frequency} mapping.
+def build_huffman_tree_linear(text):
+    frequencies = text if isinstance(text, dict) else symbol_frequencies(text)
+    leaves = deque(HuffmanNode(char, freq)
+                   for char, freq in sorted(frequencies.items(), key=lambda item: (item[1], item[0])))
+    if not leaves:
+        return None
+    if len(leaves) == 1:
+        # A lone symbol still needs a one-bit code, so give it a parent
+        root = HuffmanNode(None, leaves[0].freq)
+        root.left = leaves[0]
+        return root
+
+    merged = deque()
+    def pop_smallest():
+        if not merged or (leaves and leaves[0].freq <= merged[0].freq):
+            return leaves.popleft()
+        return merged.popleft()
+
+    while len(leaves) + len(merged) > 1:
+        left = pop_smallest()
+        right = pop_smallest()
+        node = HuffmanNode(None, left.freq + right.freq)
+        node.left = left
+        node.right = right
+        merged.append(node)
+
+    return merged[0]
+
 # Step 2: Generate Huffman Codes
-def generate_huffman_codes(root, code='', huffman_codes={}):
+def generate_huffman_codes(root, code='', huffman_codes=None):
+    if huffman_codes is None:
+        huffman_codes = {}
     if root is None:
-        return
+        return huffman_codes
     if root.char is not None:
         huffman_codes[root.char] = code
     generate_huffman_codes(root.left, code + '0', huffman_codes)
@@ -43,8 +227,210 @@ def generate_huffman_codes(root, code='', huffman_codes={}):
 def huffman_encode(text, huffman_codes):
     return ''.join(huffman_codes[char] for char in text)
 
+# Step 3b: Encode Text straight into a packed bitstream
+def huffman_encode_packed(text, huffman_codes):
+    if isinstance(huffman_codes, Codebook):
+        return huffman_codes.encode(text)
+    packed = bytearray()
+    carry = ''
+    for start in range(0, len(text), PACK_CHUNK_SIZE):
+        bits = carry + ''.join(map(huffman_codes.__getitem__, text[start:start + PACK_CHUNK_SIZE]))
+        whole = len(bits) - len(bits) % 8
+        if whole:
+            packed += int(bits[:whole], 2).to_bytes(whole // 8, 'big')
+        carry = bits[whole:]
+
+    bit_length = len(packed) * 8 + len(carry)
+    if carry:
+        packed.append(int(carry.ljust(8, '0'), 2))
+    packed += BIT_LENGTH_TRAILER.pack(bit_length)
+    return bytes(packed)
+
+# Step 3c: Reusable Codebook
+# Built once per codebook and reused for every text it encodes. Each code is
+# kept as an integer value and a bit length. For byte alphabets (and ASCII
+# text) those integers form a pair table over every two-byte word, and
+# encode() packs the pairs' values with integer shifts, 64 bits per output
+# word (see _pack_code_words), carrying the last partial byte into the next
+# chunk. Without NumPy, for other alphabets, or for codes past
+# PAIR_MAX_CODE_LENGTH, the '0'/'1' strings are joined instead.
+PAIR_CHUNK_SIZE = 1 << 20  # Bytes per vectorised step; even, so no pair straddles two chunks
+PAIR_MAX_CODE_LENGTH = 32  # Two codes must fit in one 64-bit word
+
+class Codebook:
+    __slots__ = ('codes', 'values', 'lengths', 'text_symbols', '_pairs')
+
+    def __init__(self, huffman_codes):
+        self.codes = dict(huffman_codes)
+        self.values = {char: int(code or '0', 2) for char, code in self.codes.items()}
+        self.lengths = {char: len(code) for char, code in self.codes.items()}
+        self.text_symbols = any(isinstance(char, str) for char in self.codes)
+        self._pairs = None  # Not built yet; False when this codebook cannot have one
+
+    @classmethod
+    def from_tree(cls, root):
+        return cls(generate_huffman_codes(root))
+
+    @classmethod
+    def from_code_lengths(cls, code_lengths):
+        return cls(canonical_huffman_codes(code_lengths))
+
+    def __len__(self):
+        return len(self.codes)
+
+    # (pair values, pair lengths, byte values, byte lengths) as NumPy arrays, or None.
+    # A pair is indexed by its two bytes read as a little-endian 16-bit word.
+    def pair_table(self):
+        if self._pairs is None:
+            self._pairs = self._build_pair_table() or False
+        return self._pairs or None
+
+    def _build_pair_table(self):
+        if np is None:
+            return None
+        byte_values = np.zeros(256, dtype=np.uint64)
+        byte_lengths = np.full(256, -(1 << 16), dtype=np.int64)  # Outside the codebook: any pair with it is negative
+        for char, value in self.values.items():
+            if self.text_symbols:
+                byte = ord(char) if isinstance(char, str) and len(char) == 1 and char.isascii() else None
+            else:
+                byte = char if 0 <= char < 256 else None
+            if byte is None or not 1 <= self.lengths[char] <= PAIR_MAX_CODE_LENGTH:
+                return None
+            byte_values[byte], byte_lengths[byte] = value, self.lengths[char]
+        words = np.arange(1 << 16)
+        first, second = words & 0xFF, words >> 8
+        shift = np.maximum(byte_lengths[second], 0).astype(np.uint64)
+        pair_values = (byte_values[first] << shift) | byte_values[second]
+        pair_lengths = byte_lengths[first] + byte_lengths[second]
+        return pair_values, pair_lengths, byte_values, byte_lengths
+
+    # The input as bytes for the pair table, or None when it has to take the string path
+    def _pair_input(self, text):
+        if self.pair_table() is None:
+            return None
+        if isinstance(text, str):
+            return text.encode('ascii') if self.text_symbols and text.isascii() else None
+        return None if self.text_symbols else text
+
+    # Same packed format as huffman_encode_packed
+    def encode(self, text):
+        data = self._pair_input(text)
+        if data is None:
+            return self._encode_strings(text)
+        pair_values, pair_lengths, byte_values, byte_lengths = self._pairs
+        packed = bytearray()
+        carry_value = carry_length = 0
+        for start in range(0, len(data), PAIR_CHUNK_SIZE):
+            window = data[start:start + PAIR_CHUNK_SIZE]
+            words = np.frombuffer(window, dtype='<u2', count=len(window) // 2)
+            values, lengths = pair_values[words], pair_lengths[words]
+            if len(window) % 2:  # Odd tail: the last byte is coded on its own
+                values = np.append(values, byte_values[window[-1]])
+                lengths = np.append(lengths, byte_lengths[window[-1]])
+            if lengths.size and lengths.min() < 0:
+                return self._encode_strings(text)  # A symbol outside the codebook; raises KeyError
+            if carry_length:
+                values = np.concatenate(([carry_value], values)).astype(np.uint64)
+                lengths = np.concatenate(([carry_length], lengths))
+            payload, bit_length = _pack_code_words(values, lengths)
+            whole, carry_length = bit_length // 8, bit_length % 8
+            packed += payload[:whole]
+            carry_value = payload[whole] >> (8 - carry_length) if carry_length else 0
+
+        bit_length = len(packed) * 8 + carry_length
+        if carry_length:
+            packed.append(carry_value << (8 - carry_length))
+        packed += BIT_LENGTH_TRAILER.pack(bit_length)
+        return bytes(packed)
+
+    # Joins the '0'/'1' strings one chunk at a time and folds each into an integer accumulator
+    def _encode_strings(self, text):
+        packed = bytearray()
+        accumulator = pending = 0
+        for start in range(0, len(text), PACK_CHUNK_SIZE):
+            bits = ''.join(map(self.codes.__getitem__, text[start:start + PACK_CHUNK_SIZE]))
+            if not bits:
+                continue
+            accumulator = (accumulator << len(bits)) | int(bits, 2)
+            pending += len(bits)
+            whole, pending = pending // 8, pending % 8
+            if whole:
+                packed += (accumulator >> pending).to_bytes(whole, 'big')
+                accumulator &= (1 << pending) - 1
+
+        bit_length = len(packed) * 8 + pending
+        if pending:
+            packed.append(accumulator << (8 - pending))
+        packed += BIT_LENGTH_TRAILER.pack(bit_length)
+        return bytes(packed)
+
+# Pack codes (uint64 values, bit lengths up to 64) back to back, 64 bits per
+# output word: each code is shifted into the word holding its first bit, and
+# a code crossing into the next word has its low bits shifted into that one.
+# Returns (big-endian bytes padded to a whole byte, bit length).
+def _pack_code_words(values, lengths):
+    ends = np.cumsum(lengths)
+    bit_length = int(ends[-1]) if ends.size else 0
+    starts = ends - lengths
+    word_count = (bit_length + 63) >> 6
+    words = np.zeros(word_count + 1, dtype=np.uint64)
+    indexes = starts >> 6
+    room = 64 - (starts & 63) - lengths  # Bits left in the word after the code; negative when it spills
+    fits = room >= 0
+    heads = np.where(fits, values << np.maximum(room, 0).astype(np.uint64),
+                     values >> np.maximum(-room, 0).astype(np.uint64))
+    # Codes sharing a word never overlap, so adding their shifted values ORs them together
+    bounds = np.flatnonzero(np.diff(indexes, prepend=-1))
+    words[indexes[bounds]] += np.add.reduceat(heads, bounds)
+    spills = ~fits
+    words[indexes[spills] + 1] += values[spills] << (64 + room[spills]).astype(np.uint64)
+    return words[:word_count].astype('>u8').tobytes()[:(bit_length + 7) // 8], bit_length
+
+# Pack a '0'/'1' string into bytes followed by the bit-length trailer
+def pack_bits(binary_string):
+    bit_length = len(binary_string)
+    padding = -bit_length % 8
+    payload = b''
+    if bit_length:
+        payload = int(binary_string + '0' * padding, 2).to_bytes((bit_length + padding) // 8, 'big')
+    return payload + BIT_LENGTH_TRAILER.pack(bit_length)
+
+# Split a packed bitstream into its payload length (bytes) and valid bit count
+def read_bit_length(packed):
+    if len(packed) < BIT_LENGTH_TRAILER.size:
+        raise ValueError("Packed bitstream is missing its bit-length trailer")
+    payload_length = len(packed) - BIT_LENGTH_TRAILER.size
+    (bit_length,) = BIT_LENGTH_TRAILER.unpack_from(packed, payload_length)
+    if payload_length != (bit_length + 7) // 8:
+        raise ValueError("Packed bitstream length does not match its trailer")
+    return payload_length, bit_length
+
+# Yield the valid bits of a packed bitstream as '0'/'1' strings, one chunk at a time
+def iter_packed_bits(packed):
+    payload_length, bit_length = read_bit_length(packed)
+    payload = memoryview(packed)[:payload_length]
+    remaining = bit_length
+    for start in range(0, payload_length, PACK_CHUNK_SIZE):
+        chunk = payload[start:start + PACK_CHUNK_SIZE]
+        bits = format(int.from_bytes(chunk, 'big'), f'0{len(chunk) * 8}b')
+        yield bits[:remaining]
+        remaining -= len(bits)
+
+# Unpack a packed bitstream back into a '0'/'1' string
+def unpack_bits(packed):
+    return ''.join(iter_packed_bits(packed))
+
 # Step 4: Apply RLE Compression
-def rle_compress(binary_string):
+def rle_compress(binary_string, backend=None):
+    backend = _rle_backend(backend)
+    if not binary_string:
+        return ''
+    if backend == 'numpy':
+        return _rle_compress_numpy(binary_string)
+    if not set(binary_string) <= {'0', '1'}:
+        raise ValueError("RLE input must contain only '0' and '1'")
+
     compressed = []
     count = 1
     for i in range(1, len(binary_string)):
@@ -57,31 +443,418 @@ def rle_compress(binary_string):
     return ','.join(compressed)
 
 # Step 5: Decode RLE
-def rle_decompress(rle_data):
+def rle_decompress(rle_data, backend=None):
+    backend = _rle_backend(backend)
+    if not rle_data:
+        return ''
+    if backend == 'numpy':
+        return _rle_decompress_numpy(rle_data)
+
     decompressed = []
     rle_pairs = rle_data.split(',')
     for pair in rle_pairs:
         count, bit = pair.split(':')
+        if bit not in ('0', '1'):
+            raise ValueError(f"Invalid RLE bit {bit!r}")
+        if not 0 <= int(count) <= sys.maxsize:
+            raise ValueError(f"Invalid RLE count {count!r}")
         decompressed.append(bit * int(count))
     return ''.join(decompressed)
 
+def _rle_backend(backend):
+    backend = backend or RLE_BACKEND
+    if backend == 'numpy' and np is None:
+        raise ValueError("The 'numpy' RLE backend needs NumPy installed")
+    if backend not in ('numpy', 'python'):
+        raise ValueError(f"Unknown RLE backend: {backend!r}")
+    return backend
+
+# NumPy RLE: runs start wherever np.diff of the uint8 bit array is non-zero
+def _rle_compress_numpy(binary_string):
+    bits = np.frombuffer(binary_string.encode('ascii'), dtype=np.uint8) - ord('0')
+    if (bits > 1).any():
+        raise ValueError("RLE input must contain only '0' and '1'")
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bits)) + 1))
+    counts = np.diff(np.append(starts, bits.size))
+    return ','.join(f"{count}:{bit}" for count, bit in zip(counts.tolist(), bits[starts].tolist()))
+
+def _rle_decompress_numpy(rle_data):
+    # Exactly one ':' per pair, so '1:1:1:1' is not read as two pairs
+    if rle_data.count(':') != rle_data.count(',') + 1:
+        raise ValueError("RLE pairs must have the form count:bit")
+    fields = rle_data.replace(':', ',').split(',')
+    if not set(fields[1::2]) <= {'0', '1'}:
+        raise ValueError("Invalid RLE bit")
+    try:
+        counts = np.array(fields[0::2], dtype=np.int64)
+    except OverflowError as error:
+        raise ValueError(f"Invalid RLE count: {error}") from None
+    if (counts < 0).any():
+        raise ValueError("Invalid RLE count")
+    bits = np.array(fields[1::2], dtype=np.uint8)
+    return (np.repeat(bits, counts) + ord('0')).tobytes().decode('ascii')
+
+# Step 5b: Binary RLE
+# Only run lengths are stored, as LEB128 varints. Runs alternate between '0'
+# and '1' starting with '0', so a stream that starts with '1' begins with a
+# zero-length run. `bits` is a '0'/'1' string or a packed bitstream.
+def rle_runs(bits, backend=None):
+    if _rle_backend(backend) == 'numpy':
+        return _rle_runs_numpy(bits)
+
+    if isinstance(bits, str):
+        if not set(bits) <= {'0', '1'}:
+            raise ValueError("RLE input must contain only '0' and '1'")
+        chunks = [bits]
+    else:
+        chunks = iter_packed_bits(bits)
+    runs = [0]  # The current run is always runs[-1]
+    current = '0'
+    for chunk in chunks:
+        for match in RUN_PATTERN.finditer(chunk):
+            run = match.group()
+            if run[0] == current:
+                runs[-1] += len(run)
+            else:
+                runs.append(len(run))
+                current = run[0]
+    return runs if runs != [0] else []
+
+def _rle_runs_numpy(bits):
+    if isinstance(bits, str):
+        array = np.frombuffer(bits.encode('ascii'), dtype=np.uint8) - ord('0')
+        if (array > 1).any():
+            raise ValueError("RLE input must contain only '0' and '1'")
+    else:
+        payload_length, bit_length = read_bit_length(bits)
+        array = np.unpackbits(np.frombuffer(bits, dtype=np.uint8, count=payload_length))[:bit_length]
+    if not array.size:
+        return []
+    boundaries = np.concatenate(([0], np.flatnonzero(np.diff(array)) + 1, [array.size]))
+    runs = np.diff(boundaries).tolist()
+    return [0] + runs if array[0] else runs
+
+def rle_compress_binary(bits, backend=None):
+    return encode_runs(rle_runs(bits, backend))
+
+def encode_runs(runs):
+    if max(runs, default=0) < 0x80:  # Every varint is a single byte
+        return bytes(runs)
+    return b''.join(map(encode_varint, runs))
+
+# Decode binary RLE back into a packed bitstream
+def rle_decompress_binary(rle_data, backend=None):
+    backend = _rle_backend(backend)
+    if backend == 'numpy':
+        data = np.frombuffer(rle_data, dtype=np.uint8)
+        if data.size and (data < 0x80).all():
+            runs = data
+        else:
+            runs = np.array(_decode_varints(rle_data), dtype=np.int64)
+        bits = np.repeat(np.arange(runs.size, dtype=np.uint8) & 1, runs)
+        return np.packbits(bits).tobytes() + BIT_LENGTH_TRAILER.pack(bits.size)
+
+    runs = _decode_varints(rle_data)
+    return pack_bits(''.join(('0', '1')[index & 1] * run for index, run in enumerate(runs)))
+
+def _decode_varints(data):
+    values = []
+    pos = 0
+    while pos < len(data):
+        value, pos = decode_varint(data, pos)
+        values.append(value)
+    return values
+
+# Step 5c: Fused Huffman -> RLE
+# Runs straight from the symbols, without building the Huffman bitstring. Each
+# code is summarised once as (first bit, leading run, remaining runs, last
+# bit); a code's leading run joins the previous run when their bits match, so
+# the runs of adjacent codes merge by addition. Same result as
+# rle_runs(huffman_encode(text, huffman_codes)).
+def code_run_summary(code):
+    runs = [len(match.group()) for match in RUN_PATTERN.finditer(code)]
+    if not runs:
+        raise ValueError("Huffman codes must be at least one bit long")
+    return code[0], runs[0], tuple(runs[1:]), code[-1]
+
+def huffman_rle_runs(text, huffman_codes):
+    if isinstance(huffman_codes, Codebook):
+        huffman_codes = huffman_codes.codes
+    summaries = {char: code_run_summary(code) for char, code in huffman_codes.items()}
+    run = 0  # The open run: the next code can still extend it
+    current = '0'
+    for char in text:
+        first, lead, rest, last = summaries[char]
+        if first == current:
+            run += lead
+        else:
+            yield run
+            run = lead
+        if rest:
+            yield run
+            yield from rest[:-1]
+            run = rest[-1]
+        current = last
+    if run:
+        yield run
+
+# Writes runs to dst as binary or text RLE, RUN_CHUNK_SIZE runs at a time, so
+# a run generator is never held whole. Returns (runs, bits, bytes written).
+RUN_CHUNK_SIZE = 1 << 16
+
+def write_runs(runs, dst, binary_rle=False):
+    runs = iter(runs)
+    run_count = bit_length = written = 0
+    while True:
+        chunk = list(islice(runs, RUN_CHUNK_SIZE))
+        if not chunk:
+            return run_count, bit_length, written
+        if binary_rle:
+            data = encode_runs(chunk)
+        else:
+            data = format_runs(chunk, run_count).encode('ascii')
+            if data and written:
+                data = b',' + data
+        dst.write(data)
+        run_count += len(chunk)
+        bit_length += sum(chunk)
+        written += len(data)
+
+# Text RLE ("count:bit" pairs) from binary RLE runs; start is the index of the first run
+def format_runs(runs, start=0):
+    return ','.join(f"{run}:{index & 1}" for index, run in enumerate(runs, start) if run)
+
+# Text RLE ("count:bit" pairs) back into binary RLE runs
+def parse_runs(rle_data):
+    runs = [0]  # The current run is always runs[-1]
+    current = '0'
+    for pair in rle_data.split(',') if rle_data else []:
+        count, bit = pair.split(':')
+        if bit not in ('0', '1') or int(count) < 0:
+            raise ValueError(f"Invalid RLE pair {pair!r}")
+        if bit == current:
+            runs[-1] += int(count)
+        else:
+            runs.append(int(count))
+            current = bit
+    return runs if runs != [0] else []
+
+# Binary RLE back into runs; single-byte varints are the runs themselves
+def decode_runs(rle_data):
+    if max(rle_data, default=0) < 0x80:
+        return bytes(rle_data)
+    return _decode_varints(rle_data)
+
 # Step 6: Decode Huffman Encoding
 def huffman_decode(encoded_text, huffman_tree):
+    if isinstance(huffman_tree, ArrayHuffmanTree):
+        return _huffman_decode_array([encoded_text], huffman_tree)
     decoded_text = []
     current_node = huffman_tree
     for bit in encoded_text:
         if bit == '0':
             current_node = current_node.left
-        else:
+        elif bit == '1':
             current_node = current_node.right
+        else:
+            raise ValueError(f"Invalid bit {bit!r} in encoded text")
 
         if current_node.char is not None:  # Leaf node
             decoded_text.append(current_node.char)
             current_node = huffman_tree  # Reset to the root
-    return ''.join(decoded_text)
+    return join_symbols(decoded_text)
+
+# Step 6b: Decode Huffman straight from a packed bitstream
+def huffman_decode_packed(packed, huffman_tree):
+    if isinstance(huffman_tree, ArrayHuffmanTree):
+        return _huffman_decode_array(iter_packed_bits(packed), huffman_tree)
+    decoded_text = []
+    current_node = huffman_tree
+    for bits in iter_packed_bits(packed):
+        for bit in bits:
+            if bit == '0':
+                current_node = current_node.left
+            else:
+                current_node = current_node.right
+
+            if current_node.char is not None:  # Leaf node
+                decoded_text.append(current_node.char)
+                current_node = huffman_tree  # Reset to the root
+    return join_symbols(decoded_text)
+
+# Tree walk over an ArrayHuffmanTree: node numbers instead of object attributes
+def _huffman_decode_array(chunks, huffman_tree):
+    left, right, symbols = huffman_tree.left, huffman_tree.right, huffman_tree.symbols
+    decoded_text = []
+    append = decoded_text.append
+    node = 0
+    for bits in chunks:
+        for bit in bits:
+            if bit == '0':
+                node = left[node]
+            elif bit == '1':
+                node = right[node]
+            else:
+                raise ValueError(f"Invalid bit {bit!r} in encoded text")
+            if node < 0:
+                raise ValueError("Invalid Huffman code in encoded data")
+            symbol = symbols[node]
+            if symbol is not None:  # Leaf node
+                append(symbol)
+                node = 0  # Reset to the root
+    return join_symbols(decoded_text)
+
+# Byte-mode symbols are ints 0-255, so decoders return bytes rather than str for them
+def join_symbols(symbols):
+    if symbols and isinstance(symbols[0], int):
+        return bytes(symbols)
+    return ''.join(symbols)
+
+def symbol_string(char):
+    return bytes((char,)) if isinstance(char, int) else char
+
+# Step 6c: Build a multi-bit lookup table for table-driven decoding
+# `entries` maps every window of `level_bits` bits to (chars, consumed): the
+# codes that fit completely in the window, decoded, and how many bits they
+# take. Windows that start with a code longer than the window map to
+# (None, sub_table), a table for the bits that follow. A sub-table entry holds
+# just the one code it completes: the bits after it start a new code from the
+# top-level table, not another suffix.
+class HuffmanDecodeTable:
+    def __init__(self, huffman_codes, table_bits=DECODE_TABLE_BITS, secondary=False):
+        self.codes = {code: symbol_string(char) for char, code in huffman_codes.items()}
+        self.empty = b'' if any(isinstance(char, int) for char in huffman_codes) else ''
+        self.max_code_length = max(map(len, self.codes), default=0)
+        # Secondary tables never look past the end of their longest code
+        self.level_bits = max(1, min(table_bits, self.max_code_length)) if secondary else table_bits
+        self.entries = {}
+
+        for index in range(1 << self.level_bits):
+            window = format(index, f'0{self.level_bits}b')
+            chars = []
+            consumed = 0
+            length = 1
+            while consumed + length <= self.level_bits:
+                char = self.codes.get(window[consumed:consumed + length])
+                if char is None:
+                    length += 1
+                else:
+                    chars.append(char)
+                    consumed += length
+                    length = 1
+                    if secondary:
+                        break
+            if chars:
+                self.entries[window] = (self.empty.join(chars), consumed)
+
+        # Prefixes of codes longer than the window get a secondary table
+        long_codes = {}
+        for char, code in huffman_codes.items():
+            if len(code) > self.level_bits:
+                long_codes.setdefault(code[:self.level_bits], {})[char] = code[self.level_bits:]
+        for prefix, suffixes in long_codes.items():
+            self.entries[prefix] = (None, HuffmanDecodeTable(suffixes, table_bits, secondary=True))
+
+def build_decode_table(huffman_codes, table_bits=DECODE_TABLE_BITS):
+    return HuffmanDecodeTable(huffman_codes, table_bits)
+
+# Decode whole windows from `bits` while at least one full code is left; returns the stop position
+def _decode_windows(bits, decode_table, append):
+    entries = decode_table.entries
+    level_bits = decode_table.level_bits
+    limit = len(bits) - max(level_bits, decode_table.max_code_length)
+    pos = 0
+    while pos <= limit:
+        chars, consumed = entries[bits[pos:pos + level_bits]]
+        if chars is None:  # Long code: resolve it through the secondary tables
+            pos += level_bits
+            sub_table = consumed
+            chars, consumed = sub_table.entries[bits[pos:pos + sub_table.level_bits]]
+            while chars is None:
+                pos += sub_table.level_bits
+                sub_table = consumed
+                chars, consumed = sub_table.entries[bits[pos:pos + sub_table.level_bits]]
+        append(chars)
+        pos += consumed
+    return pos
+
+# Step 6d: Decode Huffman with the lookup table, several bits per step
+def huffman_decode_table(encoded, decode_table):
+    chunks = [encoded] if isinstance(encoded, str) else iter_packed_bits(encoded)
+    decoded_text = []
+    append = decoded_text.append
+    tail = ''
+    try:
+        for bits in chunks:
+            bits = tail + bits
+            tail = bits[_decode_windows(bits, decode_table, append):]
+    except KeyError:
+        raise ValueError("Invalid Huffman code in encoded data") from None
+
+    # The last few codes are shorter than a full window: match them one by one
+    start = 0
+    for end in range(1, len(tail) + 1):
+        char = decode_table.codes.get(tail[start:end])
+        if char is not None:
+            append(char)
+            start = end
+    if start != len(tail):
+        raise ValueError("Encoded data ends in the middle of a Huffman code")
+    return decode_table.empty.join(decoded_text)
+
+# Step 6e: Fused RLE -> Huffman
+# Decodes runs without expanding them into bits. For each node and bit the
+# tree records the chain of nodes that bit leads through, down to a leaf (or
+# a missing child). A run shorter than its chain just moves to the node that
+# many steps down; a longer one emits the leaf and carries on from the root,
+# where the all-0 (or all-1) code repeats run // length times in one step.
+def huffman_decode_runs(runs, huffman_tree):
+    if not isinstance(huffman_tree, ArrayHuffmanTree):
+        huffman_tree = ArrayHuffmanTree.from_nodes(huffman_tree)
+    symbols = huffman_tree.symbols
+    paths = []
+    for children in (huffman_tree.left, huffman_tree.right):
+        chains = [()] * len(symbols)
+        leaves = [None] * len(symbols)  # Symbol at the end of the chain, None if it has none
+        for node in reversed(range(len(symbols))):  # Children come after their parents
+            child = children[node]
+            if child < 0:
+                continue
+            if symbols[child] is not None:
+                chains[node], leaves[node] = (child,), symbol_string(symbols[child])
+            else:
+                chains[node], leaves[node] = (child,) + chains[child], leaves[child]
+        paths.append((chains, leaves))
+
+    pieces = []
+    append = pieces.append
+    node = 0
+    for index, run in enumerate(runs):
+        chains, leaves = paths[index & 1]
+        while run:
+            chain = chains[node]
+            if run < len(chain) or leaves[node] is None:
+                if run > len(chain):
+                    raise ValueError("Invalid Huffman code in encoded data")
+                node = chain[run - 1]  # The run ends before a leaf
+                break
+            append(leaves[node])
+            run -= len(chain)
+            node = 0
+            if leaves[0] is not None and run >= len(chains[0]):
+                count, run = divmod(run, len(chains[0]))
+                append(leaves[0] * count)
+    if node != 0:
+        raise ValueError("Encoded data ends in the middle of a Huffman code")
+    if pieces and isinstance(pieces[0], bytes):
+        return b''.join(pieces)
+    return ''.join(pieces)
 
 # Step 7: Rebuild Huffman Tree from Codes
-def rebuild_huffman_tree(huffman_codes):
+# compact=True returns an ArrayHuffmanTree instead of HuffmanNode objects
+def rebuild_huffman_tree(huffman_codes, compact=False):
+    if compact:
+        return ArrayHuffmanTree(huffman_codes)
     root = HuffmanNode(None, 0)
     for char, code in huffman_codes.items():
         current_node = root
@@ -97,68 +870,1025 @@ def rebuild_huffman_tree(huffman_codes):
         current_node.char = char  # Assign character at the leaf
     return root
 
-# Compression Function
-def compress_file(input_file, output_file, tree_file):
-    with open(input_file, 'r') as f:
-        text = f.read()
+# Step 7b: Array-Backed Huffman Tree
+# The tree as flat arrays instead of one object per node: node 0 is the root,
+# left/right hold child node numbers (-1 where there is no child) and symbols
+# holds each leaf's symbol (None for internal nodes). A node costs two 4-byte
+# array slots and a list slot. Accepted by huffman_decode,
+# huffman_decode_packed and huffman_tree_view.
+class ArrayHuffmanTree:
+    __slots__ = ('left', 'right', 'symbols')
 
-    # Huffman Coding
-    root = build_huffman_tree(text)
-    huffman_codes = generate_huffman_codes(root)
-    encoded_text = huffman_encode(text, huffman_codes)
+    def __init__(self, huffman_codes=None):
+        self.left = array('i', [-1])
+        self.right = array('i', [-1])
+        self.symbols = [None]
+        for char, code in (huffman_codes or {}).items():
+            self.add_code(char, code)
 
-    # Run-Length Encoding
-    rle_output = rle_compress(encoded_text)
+    def _new_node(self, symbol=None):
+        self.left.append(-1)
+        self.right.append(-1)
+        self.symbols.append(symbol)
+        return len(self.symbols) - 1
 
-    # Write Outputs
-    with open(output_file, 'w') as f:
-        f.write(rle_output)
-    with open(tree_file, 'w') as f:
-        f.write(str(huffman_codes))
+    def add_code(self, char, code):
+        node = 0
+        for bit in code:
+            children = self.left if bit == '0' else self.right
+            if children[node] < 0:
+                children[node] = self._new_node()
+            node = children[node]
+        self.symbols[node] = char  # Assign character at the leaf
+
+    @classmethod
+    def from_nodes(cls, root):
+        tree = cls()
+        if root is None:
+            return tree
+        tree.symbols[0] = root.char
+        stack = [(root, 0)]
+        while stack:
+            node, index = stack.pop()
+            for child, children in ((node.left, tree.left), (node.right, tree.right)):
+                if child is not None:
+                    children[index] = tree._new_node(child.char)
+                    stack.append((child, children[index]))
+        return tree
 
-    # Compression Ratio
-    original_size = len(text) * 8  # Original in bits
+    def codes(self):
+        huffman_codes = {}
+        stack = [(0, '')]
+        while stack:
+            node, code = stack.pop()
+            if self.symbols[node] is not None:
+                huffman_codes[self.symbols[node]] = code
+            if self.left[node] >= 0:
+                stack.append((self.left[node], code + '0'))
+            if self.right[node] >= 0:
+                stack.append((self.right[node], code + '1'))
+        return huffman_codes
 
-    # Estimate compressed size in bits
-    rle_pairs = rle_output.split(',')
-    compressed_size = sum(math.ceil(math.log2(int(pair.split(':')[0]) + 1)) + 1 for pair in rle_pairs)
+    def __len__(self):
+        return len(self.symbols)
 
-    compression_ratio = (original_size - compressed_size) / original_size * 100
+# Step 8: Canonical Huffman Codes
+# Only the code length of each symbol is stored; the codes themselves are
+# reassigned in (length, symbol) order, so encoder and decoder derive the
+# same codebook from the lengths alone.
+def huffman_code_lengths(root):
+    code_lengths = {}
+    stack = [(root, 0)] if root is not None else []
+    while stack:
+        node, depth = stack.pop()
+        if node.char is not None:
+            code_lengths[node.char] = depth
+            continue
+        if node.left is not None:
+            stack.append((node.left, depth + 1))
+        if node.right is not None:
+            stack.append((node.right, depth + 1))
+    return code_lengths
+
+def canonical_huffman_codes(code_lengths):
+    huffman_codes = {}
+    code = 0
+    previous_length = 0
+    for char, length in sorted(code_lengths.items(), key=lambda item: (item[1], item[0])):
+        code <<= length - previous_length
+        if length < 1 or code >= 1 << length:
+            raise ValueError("Code lengths do not describe a valid prefix code")
+        huffman_codes[char] = format(code, f'0{length}b')
+        code += 1
+        previous_length = length
+    return huffman_codes
+
+# Step 8b: Length-Limited Code Lengths (package-merge)
+# Optimal code lengths subject to max_code_length. Each of the
+# max_code_length - 1 rounds pairs up the cheapest items into packages and
+# merges them back with the leaves; a symbol's code length is the number of
+# times it appears in the cheapest 2n - 2 items of the final list.
+def length_limited_code_lengths(frequencies, max_code_length):
+    symbols = sorted(frequencies, key=lambda char: (frequencies[char], char))
+    if len(symbols) <= 1:
+        return {char: 1 for char in symbols}
+    if len(symbols) > 1 << max_code_length:
+        raise ValueError(f"{len(symbols)} symbols do not fit in codes of at most {max_code_length} bits")
+
+    leaves = [(frequencies[char], (index,)) for index, char in enumerate(symbols)]
+    items = leaves
+    for _ in range(max_code_length - 1):
+        packages = [(items[i][0] + items[i + 1][0], items[i][1] + items[i + 1][1])
+                    for i in range(0, len(items) - 1, 2)]
+        items = sorted(leaves + packages, key=lambda item: item[0])  # Stable: leaves win ties
+
+    lengths = [0] * len(symbols)
+    for _, members in items[:2 * len(symbols) - 2]:
+        for index in members:
+            lengths[index] += 1
+    return dict(zip(symbols, lengths))
+
+def huffman_frequencies(root):
+    frequencies = {}
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        if node.char is not None:
+            frequencies[node.char] = node.freq
+        else:
+            stack.extend(child for child in (node.left, node.right) if child is not None)
+    return frequencies
+
+# Code lengths from the Huffman tree, capped at max_code_length when given
+def limited_code_lengths(root, max_code_length=None):
+    code_lengths = huffman_code_lengths(root)
+    if max_code_length is not None and max(code_lengths.values(), default=0) > max_code_length:
+        code_lengths = length_limited_code_lengths(huffman_frequencies(root), max_code_length)
+    return code_lengths
+
+# Extra encoded size (as a % of the unlimited Huffman size) paid for a length limit
+def length_limit_cost(frequencies, code_lengths, limited_lengths):
+    optimal_bits = sum(frequencies[char] * length for char, length in code_lengths.items())
+    limited_bits = sum(frequencies[char] * length for char, length in limited_lengths.items())
+    return (limited_bits - optimal_bits) / optimal_bits * 100 if optimal_bits else 0.0
+
+# Unsigned LEB128 varints: 7 bits per byte, high bit set on all but the last byte
+def encode_varint(value):
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+def decode_varint(data, pos=0):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+# Codebook header: varint symbol count, then per symbol (in code point order)
+# the varint gap from the previous code point and a one-byte code length.
+# Byte-mode symbols are stored as their value and read back with byte_symbols=True.
+def write_codebook_header(code_lengths):
+    header = bytearray(encode_varint(len(code_lengths)))
+    previous = -1
+    for value, length in sorted((char if isinstance(char, int) else ord(char), length)
+                                for char, length in code_lengths.items()):
+        if length > 0xFF:
+            raise ValueError(f"Code length {length} does not fit in the codebook header")
+        header += encode_varint(value - previous - 1)
+        header.append(length)
+        previous = value
+    return bytes(header)
+
+def read_codebook_header(header, pos=0, byte_symbols=False):
+    count, pos = decode_varint(header, pos)
+    code_lengths = {}
+    previous = -1
+    for _ in range(count):
+        gap, pos = decode_varint(header, pos)
+        if pos >= len(header):
+            raise ValueError("Truncated codebook header")
+        previous += gap + 1
+        if byte_symbols and previous > 0xFF:
+            raise ValueError("Byte symbol out of range in codebook header")
+        code_lengths[previous if byte_symbols else chr(previous)] = header[pos]
+        pos += 1
+    return code_lengths, pos
+
+# Step 9: Block Compression
+# Every block decodes on its own with no shared state. Its type records the
+# stages it went through:
+#   BLOCK_RAW          UTF-8 text (or the bytes), when coding would not make it smaller
+#   BLOCK_HUFFMAN      codebook header + packed Huffman payload
+#   BLOCK_HUFFMAN_RLE  codebook header + binary RLE of the Huffman bits
+# With adaptive=True the smallest one is kept; otherwise always BLOCK_HUFFMAN.
+def compress_block(text, max_code_length=None, adaptive=True, stats=None):
+    if stats is None:
+        stats = CompressionStats()
+    with stats.stage('build_huffman_tree', len(text)):
+        root = build_huffman_tree_linear(text)
+    with stats.stage('build_codebook') as record:
+        code_lengths = limited_code_lengths(root, max_code_length)
+        huffman_codes = canonical_huffman_codes(code_lengths)
+        header = write_codebook_header(code_lengths)
+        record['bytes_out'] = len(header)
+    stats.maximum('alphabet_size', len(code_lengths))
+    stats.maximum('max_code_length', max(code_lengths.values(), default=0))
+    with stats.stage('huffman_encode', len(text)) as record:
+        payload = huffman_encode_packed(text, Codebook(huffman_codes))
+        record['bytes_out'] = len(payload)
+    block_type, body = BLOCK_HUFFMAN, header + payload
+
+    if adaptive:
+        with stats.stage('rle_compress', len(payload)) as record:
+            # Every run costs at least a byte, so RLE can only win with fewer runs than payload bytes
+            runs = rle_runs(payload)
+            stats.add('rle_runs', len(runs))
+            if len(runs) < len(payload):
+                rle_body = header + encode_runs(runs)
+                record['bytes_out'] = len(rle_body) - len(header)
+                if len(rle_body) < len(body):
+                    block_type, body = BLOCK_HUFFMAN_RLE, rle_body
+        raw = text.encode('utf-8') if isinstance(text, str) else bytes(text)
+        if len(raw) <= len(body):
+            block_type, body = BLOCK_RAW, raw
+
+    if len(body) > 0xFFFFFFFF:
+        raise ValueError("Block too large; use a smaller block_size")
+    stats.add(BLOCK_NAMES[block_type], 1)
+    return BLOCK_HEADER.pack(block_type, len(body)) + body
+
+def decompress_block(block_type, body, byte_symbols=False, stats=None):
+    if stats is None:
+        stats = CompressionStats()
+    if block_type == BLOCK_RAW:
+        return bytes(body) if byte_symbols else bytes(body).decode('utf-8')
+    if block_type not in (BLOCK_HUFFMAN, BLOCK_HUFFMAN_RLE):
+        raise ValueError(f"Unknown block type: {block_type}")
+    with stats.stage('read_codebook', len(body)):
+        code_lengths, pos = read_codebook_header(body, byte_symbols=byte_symbols)
+        decode_table = build_decode_table(canonical_huffman_codes(code_lengths))
+    payload = memoryview(body)[pos:]
+    if block_type == BLOCK_HUFFMAN_RLE:
+        with stats.stage('rle_decompress', len(payload)) as record:
+            payload = rle_decompress_binary(payload)
+            record['bytes_out'] = len(payload)
+    with stats.stage('huffman_decode', len(payload)) as record:
+        text = huffman_decode_table(payload, decode_table)
+        record['bytes_out'] = len(text)
+    return text
+
+# Read the next block from a container stream; returns (block_type, body)
+def read_block(src):
+    header = src.read(BLOCK_HEADER.size)
+    if len(header) != BLOCK_HEADER.size:
+        raise ValueError("Truncated block header")
+    block_type, body_length = BLOCK_HEADER.unpack(header)
+    body = src.read(body_length)
+    if len(body) != body_length:
+        raise ValueError("Truncated block body")
+    return block_type, body
+
+# Apply `function` to each argument tuple, in a process pool when workers > 1.
+# Results come back in input order; at most 2 * workers blocks are in flight.
+def map_blocks(function, arguments, workers=1):
+    if workers <= 1:
+        for args in arguments:
+            yield function(*args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for args in arguments:
+            pending.append(pool.submit(function, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+# `src` is a readable file or, in bytes mode, a bytes-like object such as a mapped file
+def _read_text_blocks(src, block_size, max_code_length):
+    if not hasattr(src, 'read'):
+        for start in range(0, len(src), block_size):
+            yield bytes(src[start:start + block_size]), max_code_length
+        return
+    while True:
+        text = src.read(block_size)
+        if not text:
+            return
+        yield text, max_code_length
+
+def _read_blocks(src, byte_symbols):
+    while True:
+        block_type, body = read_block(src)
+        if block_type == BLOCK_END:
+            return
+        yield block_type, body, byte_symbols
+
+# Block Index
+# A seekable container stores, in its end block, the (uncompressed length,
+# compressed length) of every block as varints; lengths count characters in
+# text containers and bytes in byte containers. Readers that do not use the
+# index skip it like any other block body.
+def write_block_index(block_sizes):
+    index = bytearray(encode_varint(len(block_sizes)))
+    for text_size, block_size in block_sizes:
+        index += encode_varint(text_size) + encode_varint(block_size)
+    return bytes(index)
+
+# Returns (text offsets, block offsets) with one extra entry for the end of the last block
+def read_block_index(src):
+    src.seek(0, os.SEEK_END)
+    if src.tell() < len(CONTAINER_MAGIC) + BLOCK_HEADER.size + INDEX_FOOTER.size:
+        raise ValueError("Container has no block index")
+    src.seek(-INDEX_FOOTER.size, os.SEEK_END)
+    end_offset, magic = INDEX_FOOTER.unpack(src.read(INDEX_FOOTER.size))
+    if magic != INDEX_MAGIC:
+        raise ValueError("Container has no block index")
+    src.seek(end_offset)
+    block_type, body = read_block(src)
+    if block_type != BLOCK_END:
+        raise ValueError("Block index does not point at the end block")
+    count, pos = decode_varint(body)
+    text_offsets = [0]
+    block_offsets = [len(CONTAINER_MAGIC)]
+    for _ in range(count):
+        text_size, pos = decode_varint(body, pos)
+        block_size, pos = decode_varint(body, pos)
+        text_offsets.append(text_offsets[-1] + text_size)
+        block_offsets.append(block_offsets[-1] + block_size)
+    if block_offsets[-1] != end_offset:
+        raise ValueError("Block index does not match the container")
+    return text_offsets, block_offsets
+
+# Decompress `length` characters (bytes in a byte container) starting at
+# `start`, decoding only the blocks the range touches
+def read_range(path, start, length):
+    if start < 0 or length < 0:
+        raise ValueError("start and length must not be negative")
+    with open(path, 'rb') as src:
+        byte_symbols = container_mode(src.read(len(CONTAINER_MAGIC))) == 'bytes'
+        text_offsets, block_offsets = read_block_index(src)
+        end = min(start + length, text_offsets[-1])
+        pieces = []
+        first = bisect.bisect_right(text_offsets, start) - 1
+        for block in range(first, len(text_offsets) - 1):
+            if text_offsets[block] >= end:
+                break
+            src.seek(block_offsets[block])
+            text = decompress_block(*read_block(src), byte_symbols)
+            pieces.append(text[max(start - text_offsets[block], 0):end - text_offsets[block]])
+    return (b'' if byte_symbols else '').join(pieces)
+
+# 'text' or 'bytes' for a container's leading magic
+def container_mode(magic):
+    if magic == CONTAINER_MAGIC:
+        return 'text'
+    if magic == BYTES_CONTAINER_MAGIC:
+        return 'bytes'
+    raise ValueError("Not a block container")
+
+# Serial runs record straight into `stats`; in worker processes each block
+# fills a fresh CompressionStats that is merged back when the block returns
+def _block_stats(stats, workers):
+    return stats if stats is None or workers <= 1 else CompressionStats()
+
+def _merge_block_stats(stats, block_stats):
+    if stats is not None and block_stats is not stats:
+        stats.merge(block_stats)
+
+# Streaming compression: memory is bounded by block_size (times the blocks in
+# flight when workers > 1). Returns (characters read, bytes written).
+# With index=True the container is seekable (see read_range). `progress` is
+# called with the number of characters (or bytes) done after every block; it
+# may raise CompressionCancelled to stop.
+def compress_stream(src, dst, block_size=DEFAULT_BLOCK_SIZE, workers=1, max_code_length=None, mode='text',
+                    stats=None, index=False, progress=None):
+    if block_size < 1:
+        raise ValueError("block_size must be positive")
+    magic = BYTES_CONTAINER_MAGIC if mode == 'bytes' else CONTAINER_MAGIC
+    dst.write(magic)
+    text_length = 0
+    compressed_length = len(magic)
+    block_sizes = []
+    blocks = ((text, max_code_length, _block_stats(stats, workers))
+              for text, max_code_length in _read_text_blocks(src, block_size, max_code_length))
+    for text_size, block, block_stats in map_blocks(_compress_block_sized, blocks, workers):
+        _merge_block_stats(stats, block_stats)
+        dst.write(block)
+        text_length += text_size
+        compressed_length += len(block)
+        block_sizes.append((text_size, len(block)))
+        if progress is not None:
+            progress(text_length)
+    if not index:
+        dst.write(BLOCK_HEADER.pack(BLOCK_END, 0))
+        return text_length, compressed_length + BLOCK_HEADER.size
+    body = write_block_index(block_sizes)
+    dst.write(BLOCK_HEADER.pack(BLOCK_END, len(body)) + body + INDEX_FOOTER.pack(compressed_length, INDEX_MAGIC))
+    return text_length, compressed_length + BLOCK_HEADER.size + len(body) + INDEX_FOOTER.size
+
+def _compress_block_sized(text, max_code_length=None, stats=None):
+    return len(text), compress_block(text, max_code_length, stats=stats), stats
+
+# Text containers write str to `dst`, byte containers write bytes
+def decompress_stream(src, dst, workers=1, stats=None):
+    byte_symbols = container_mode(src.read(len(CONTAINER_MAGIC))) == 'bytes'
+    text_length = 0
+    blocks = ((block_type, body, byte_symbols, _block_stats(stats, workers))
+              for block_type, body, byte_symbols in _read_blocks(src, byte_symbols))
+    for text, block_stats in map_blocks(_decompress_block_stats, blocks, workers):
+        _merge_block_stats(stats, block_stats)
+        dst.write(text)
+        text_length += len(text)
+    return text_length
+
+def _decompress_block_stats(block_type, body, byte_symbols=False, stats=None):
+    return decompress_block(block_type, body, byte_symbols, stats), stats
+
+# Step 10: Shared Codebooks
+# For short messages the per-message tree and codebook cost more than the
+# payload, so a codebook is trained once on a sample corpus and referenced by
+# ID. Text codebooks reserve an escape symbol (a character absent from the
+# training data): unseen characters are coded as the escape and their UTF-8
+# literals follow the payload in order. Byte codebooks cover all 256 values
+# and need no escape. A message is
+#   codebook ID | varint bit length | packed Huffman bits | escaped literals
+class SharedCodebook:
+    def __init__(self, code_lengths, escape=None, byte_symbols=False):
+        self.code_lengths = code_lengths
+        self.escape = escape
+        self.byte_symbols = byte_symbols
+        self.codes = canonical_huffman_codes(code_lengths)
+        self.codebook = Codebook(self.codes)  # Reused, so its pair table pays off across messages
+        self.decode_table = build_decode_table(self.codes)
+        self.codebook_id = hashlib.sha256(self.to_bytes()).digest()[:CODEBOOK_ID_SIZE]
+
+    def to_bytes(self):
+        escape = 0 if self.escape is None else ord(self.escape) + 1
+        return (SHARED_CODEBOOK_MAGIC + bytes([self.byte_symbols]) + encode_varint(escape)
+                + write_codebook_header(self.code_lengths))
+
+    @classmethod
+    def from_bytes(cls, data):
+        if bytes(data[:len(SHARED_CODEBOOK_MAGIC)]) != SHARED_CODEBOOK_MAGIC:
+            raise ValueError("Not a shared codebook")
+        pos = len(SHARED_CODEBOOK_MAGIC)
+        if pos >= len(data):
+            raise ValueError("Truncated shared codebook")
+        byte_symbols = bool(data[pos])
+        escape, pos = decode_varint(data, pos + 1)
+        code_lengths, pos = read_codebook_header(data, pos, byte_symbols=byte_symbols)
+        if pos != len(data):
+            raise ValueError("Trailing data after shared codebook")
+        return cls(code_lengths, chr(escape - 1) if escape else None, byte_symbols)
+
+def train_codebook(samples, byte_symbols=False, max_code_length=SHARED_MAX_CODE_LENGTH):
+    frequencies = Counter()
+    for sample in samples:
+        frequencies.update(sample)
+    escape = None
+    if byte_symbols:
+        frequencies.update(range(256))  # Every byte stays encodable
+    else:
+        escape = next(chr(value) for value in range(0x110000) if chr(value) not in frequencies)
+        frequencies[escape] = 1
+    code_lengths = limited_code_lengths(build_huffman_tree_linear(frequencies), max_code_length)
+    return SharedCodebook(code_lengths, escape, byte_symbols)
+
+def save_codebook(codebook, directory):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, codebook.codebook_id.hex() + '.hcb'), 'wb') as f:
+        f.write(codebook.to_bytes())
+    return codebook.codebook_id.hex()
+
+def load_codebook(codebook_id, directory):
+    with open(os.path.join(directory, codebook_id + '.hcb'), 'rb') as f:
+        return SharedCodebook.from_bytes(f.read())
+
+def compress_message(message, codebook):
+    literals = ''
+    unseen = set(message) - codebook.codes.keys()
+    if codebook.escape is not None and codebook.escape in message:
+        unseen.add(codebook.escape)  # The escape character itself travels as a literal
+    if unseen:
+        if codebook.escape is None:
+            raise ValueError("Message has symbols the codebook cannot encode")
+        literals = ''.join(char for char in message if char in unseen)
+        message = message.translate({ord(char): codebook.escape for char in unseen})
+    packed = huffman_encode_packed(message, codebook.codebook)
+    payload_length, bit_length = read_bit_length(packed)
+    return (codebook.codebook_id + encode_varint(bit_length) + packed[:payload_length]
+            + literals.encode('utf-8', 'surrogatepass'))
+
+# `codebooks` is one SharedCodebook or a mapping of codebook ID to codebook
+def decompress_message(data, codebooks):
+    if isinstance(codebooks, SharedCodebook):
+        codebooks = {codebooks.codebook_id: codebooks}
+    codebook = codebooks.get(bytes(data[:CODEBOOK_ID_SIZE]))
+    if codebook is None:
+        raise ValueError("Message refers to an unknown codebook")
+    bit_length, pos = decode_varint(data, CODEBOOK_ID_SIZE)
+    end = pos + (bit_length + 7) // 8
+    if end > len(data):
+        raise ValueError("Truncated message")
+    packed = bytes(data[pos:end]) + BIT_LENGTH_TRAILER.pack(bit_length)
+    message = huffman_decode_table(packed, codebook.decode_table)
+    if codebook.escape is None:
+        if end != len(data):
+            raise ValueError("Trailing data after message")
+        return message
+    pieces = message.split(codebook.escape)
+    literals = bytes(data[end:]).decode('utf-8', 'surrogatepass')
+    if len(literals) != len(pieces) - 1:
+        raise ValueError("Escaped literals do not match the message")
+    return ''.join(piece + literal for piece, literal in zip(pieces, literals)) + pieces[-1]
+
+# Step 11: Adaptive Huffman (FGK)
+# One pass: encoder and decoder start from the same empty tree and update it
+# after every symbol, so output can be written as soon as input arrives and
+# no codebook is stored. The alphabet is the 256 byte values plus an end of
+# stream marker; a symbol's first occurrence is sent as the NYT ("not yet
+# transmitted") code followed by a 9-bit literal. Text is coded as UTF-8.
+# Nodes are numbered so that weights never decrease with the number and
+# siblings are adjacent (the sibling property); the root has the highest number.
+class AdaptiveHuffmanTree:
+    def __init__(self):
+        size = 2 * (ADAPTIVE_EOF + 1) - 1
+        self.weight = []
+        self.parent = []
+        self.left = []
+        self.right = []
+        self.number = []
+        self.symbol = []
+        self.by_number = [None] * size
+        self.leaves = {}
+        self.root = self.nyt = self._new_node(-1, size - 1)
+
+    def _new_node(self, parent, number, symbol=None):
+        node = len(self.weight)
+        self.weight.append(0)
+        self.parent.append(parent)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.number.append(number)
+        self.symbol.append(symbol)
+        self.by_number[number] = node
+        return node
+
+    def code(self, node):
+        bits = []
+        while node != self.root:
+            parent = self.parent[node]
+            bits.append('1' if self.right[parent] == node else '0')
+            node = parent
+        return ''.join(reversed(bits))
+
+    def encode(self, symbol):
+        leaf = self.leaves.get(symbol)
+        if leaf is None:
+            return self.code(self.nyt) + format(symbol, f'0{ADAPTIVE_LITERAL_BITS}b')
+        return self.code(leaf)
+
+    def update(self, symbol):
+        node = self.leaves.get(symbol)
+        if node is None:
+            # Split the NYT leaf into a new NYT and a leaf for the symbol
+            parent = self.nyt
+            number = self.number[parent]
+            self.nyt = self._new_node(parent, number - 2)
+            node = self.leaves[symbol] = self._new_node(parent, number - 1, symbol)
+            self.left[parent] = self.nyt
+            self.right[parent] = node
+        while node != -1:
+            leader = self._block_leader(node)
+            if leader != node and leader != self.parent[node]:
+                self._swap(node, leader)
+            self.weight[node] += 1
+            node = self.parent[node]
+
+    # Highest-numbered node with the same weight
+    def _block_leader(self, node):
+        weight = self.weight[node]
+        by_number = self.by_number
+        number = self.number[node]
+        while number + 1 < len(by_number) and self.weight[by_number[number + 1]] == weight:
+            number += 1
+        return by_number[number]
+
+    # Exchange two subtrees (never an ancestor and its descendant) and their numbers
+    def _swap(self, a, b):
+        parent_a, parent_b = self.parent[a], self.parent[b]
+        a_is_left = self.left[parent_a] == a
+        if self.left[parent_b] == b:
+            self.left[parent_b] = a
+        else:
+            self.right[parent_b] = a
+        if a_is_left:
+            self.left[parent_a] = b
+        else:
+            self.right[parent_a] = b
+        self.parent[a], self.parent[b] = parent_b, parent_a
+        number_a, number_b = self.number[a], self.number[b]
+        self.number[a], self.number[b] = number_b, number_a
+        self.by_number[number_a], self.by_number[number_b] = b, a
+
+# feed() returns the compressed bytes completed so far; flush() ends the stream
+class AdaptiveHuffmanCompressor:
+    def __init__(self, mode='text'):
+        self.mode = mode
+        self.tree = AdaptiveHuffmanTree()
+        self.carry = ''
+        self.started = False
+        self.finished = False
+
+    def feed(self, data):
+        if self.finished:
+            raise ValueError("Compressor already flushed")
+        if self.mode == 'text':
+            data = data.encode('utf-8')
+        encode, update = self.tree.encode, self.tree.update
+        packed = bytearray()
+        if not self.started:
+            packed += ADAPTIVE_MAGIC
+            self.started = True
+        for start in range(0, len(data), PACK_CHUNK_SIZE):
+            bits = [self.carry]
+            for byte in data[start:start + PACK_CHUNK_SIZE]:
+                bits.append(encode(byte))
+                update(byte)
+            self.carry = self._pack_whole_bytes(''.join(bits), packed)
+        return bytes(packed)
+
+    def flush(self):
+        packed = bytearray(self.feed(b'' if self.mode == 'bytes' else ''))
+        bits = self.carry + self.tree.encode(ADAPTIVE_EOF)
+        self.carry = self._pack_whole_bytes(bits + '0' * (-len(bits) % 8), packed)
+        self.finished = True
+        return bytes(packed)
+
+    @staticmethod
+    def _pack_whole_bytes(bits, packed):
+        whole = len(bits) - len(bits) % 8
+        if whole:
+            packed += int(bits[:whole], 2).to_bytes(whole // 8, 'big')
+        return bits[whole:]
+
+# feed() returns the text (or bytes) decoded so far; flush() checks the stream ended
+class AdaptiveHuffmanDecompressor:
+    def __init__(self, mode='text'):
+        self.mode = mode
+        self.tree = AdaptiveHuffmanTree()
+        self.header = b''
+        self.bits = ''
+        self.finished = False
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')() if mode == 'text' else None
+
+    def feed(self, data):
+        if not data:
+            return self._output(b'')
+        if self.finished:
+            raise ValueError("Data after the end of the adaptive stream")
+        if len(self.header) < len(ADAPTIVE_MAGIC):
+            missing = len(ADAPTIVE_MAGIC) - len(self.header)
+            self.header += bytes(data[:missing])
+            data = data[missing:]
+            if len(self.header) == len(ADAPTIVE_MAGIC) and self.header != ADAPTIVE_MAGIC:
+                raise ValueError("Not an adaptive Huffman stream")
+        if data:
+            self.bits += format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b')
+        return self._output(self._decode())
+
+    def flush(self):
+        if not self.finished:
+            raise ValueError("Adaptive stream ends before its end marker")
+        return self._output(b'', final=True)
+
+    def _decode(self):
+        tree, bits = self.tree, self.bits
+        left, right, symbol = tree.left, tree.right, tree.symbol
+        decoded = bytearray()
+        pos = 0
+        while not self.finished:
+            node, end = tree.root, pos
+            while left[node] != -1 and end < len(bits):
+                node = right[node] if bits[end] == '1' else left[node]
+                end += 1
+            if left[node] != -1:
+                break  # The code continues in the next chunk
+            if node == tree.nyt:
+                if end + ADAPTIVE_LITERAL_BITS > len(bits):
+                    break
+                value = int(bits[end:end + ADAPTIVE_LITERAL_BITS], 2)
+                end += ADAPTIVE_LITERAL_BITS
+            else:
+                value = symbol[node]
+            pos = end
+            if value == ADAPTIVE_EOF:
+                self.finished = True
+                if '1' in bits[pos:] or len(bits) - pos >= 8:
+                    raise ValueError("Data after the end of the adaptive stream")
+            elif value > 0xFF:
+                raise ValueError("Invalid literal in adaptive stream")
+            else:
+                decoded.append(value)
+                tree.update(value)
+        self.bits = bits[pos:]
+        return bytes(decoded)
+
+    def _output(self, decoded, final=False):
+        if self.text_decoder is None:
+            return decoded
+        return self.text_decoder.decode(decoded, final)
+
+def report_compression(original_size, compressed_size):
+    compression_ratio = (original_size - compressed_size) / original_size * 100 if original_size else 0.0
 
     # Output the results
     print(f"Original Size (bits): {original_size}")
     print(f"Compressed Size (bits): {compressed_size}")
     print(f"Compression Ratio: {compression_ratio:.2f}%")
 
+# Open the input for compression. Text mode yields the file's text (or the
+# open file when streaming); bytes mode yields a memoryview over an mmap of
+# the file, so its contents are never copied into a Python str or bytes.
+@contextmanager
+def open_input(input_file, mode='text', streaming=False):
+    if mode == 'text':
+        with open(input_file, 'r') as f:
+            yield f if streaming else f.read()
+        return
+    if mode != 'bytes':
+        raise ValueError(f"Unknown mode: {mode!r}")
+    with open(input_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:  # Empty files cannot be mapped
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = memoryview(mapped)
+            try:
+                yield data
+            finally:
+                data.release()
+
+# Tree View
+# A readable picture of a codebook, however large. Nodes are identified by
+# their code prefix and expanded heaviest first, a subtree weighing the share
+# of the input its code lengths imply (2^-length per symbol). Subtrees lighter
+# than min_weight, deeper than max_depth, or that would take the view past
+# max_nodes are drawn as one collapsed node. Returns {prefix: label}; a
+# node's parent is its prefix without the last bit.
+def huffman_tree_view(huffman_codes, max_nodes=TREE_VIEW_NODES, min_weight=TREE_VIEW_MIN_WEIGHT, max_depth=None):
+    if isinstance(huffman_codes, ArrayHuffmanTree):
+        huffman_codes = huffman_codes.codes()
+    weights = {}
+    leaf_counts = Counter()
+    for code in huffman_codes.values():
+        for end in range(len(code) + 1):
+            weights[code[:end]] = weights.get(code[:end], 0) + 2.0 ** -len(code)
+            leaf_counts[code[:end]] += 1
+    symbols = {code: char for char, code in huffman_codes.items()}
+
+    view = {}
+    heap = [(-weights[''], '')] if huffman_codes else []
+    while heap:
+        _, prefix = heapq.heappop(heap)
+        if prefix in symbols:
+            view[prefix] = tree_view_label(symbols[prefix])
+            continue
+        children = [prefix + bit for bit in '01' if prefix + bit in weights]
+        if (weights[prefix] < min_weight or (max_depth is not None and len(prefix) >= max_depth)
+                or len(view) + len(heap) + 1 + len(children) > max_nodes):
+            view[prefix] = f"{leaf_counts[prefix]} symbols"
+            continue
+        view[prefix] = ''
+        for child in children:
+            heapq.heappush(heap, (-weights[child], child))
+    return view
+
+def tree_view_label(char):
+    if isinstance(char, int):
+        return chr(char) if 0x21 <= char <= 0x7E else f"0x{char:02x}"
+    return char if char.isprintable() and not char.isspace() else repr(char)
+
+# (x, y) of a view node, in the same layout as the full tree drawings
+def tree_view_position(prefix):
+    return sum((1 if bit == '1' else -1) * 2.0 ** -(depth + 1) for depth, bit in enumerate(prefix)), -len(prefix)
+
+# Result Cache
+# Results are keyed by a hash of the input bytes and the options used, and held
+# pickled, so the memory ceiling counts exactly what is stored. Least recently
+# used entries are evicted first; with a spill_dir they move to disk instead of
+# being dropped and are promoted back to memory on the next hit.
+class ResultCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.memory_bytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    @staticmethod
+    def key(data, *options):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        digest = hashlib.sha256(data)
+        digest.update(repr(options).encode('utf-8'))
+        return digest.hexdigest()
+
+    def spill_path(self, key):
+        return os.path.join(self.spill_dir, key + '.pkl')
+
+    def get(self, key, default=None):
+        with self.lock:
+            blob = self.entries.get(key)
+            if blob is not None:
+                self.entries.move_to_end(key)
+            elif self.spill_dir is not None and os.path.exists(self.spill_path(key)):
+                with open(self.spill_path(key), 'rb') as f:
+                    blob = f.read()
+                self._store(key, blob)
+            else:
+                return default
+        return pickle.loads(blob)
+
+    def put(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self._store(key, blob)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, self)
+        if value is self:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _store(self, key, blob):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.memory_bytes -= len(old)
+        self.entries[key] = blob
+        self.memory_bytes += len(blob)
+        while self.memory_bytes > self.max_bytes:
+            evicted_key, evicted = self.entries.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+            if self.spill_dir is not None:
+                self._spill(evicted_key, evicted)
+
+    def _spill(self, key, blob):
+        path = self.spill_path(key)
+        if os.path.exists(path):
+            return
+        # Write then rename, so a concurrent reader never sees a partial file
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(temp_path, path)
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries or (self.spill_dir is not None and os.path.exists(self.spill_path(key)))
+
+    def __len__(self):
+        return len(self.entries)
+
+# Compression Function
+def compress_file(input_file, output_file, tree_file, packed=False, canonical=False,
+                  streaming=False, block_size=DEFAULT_BLOCK_SIZE, workers=1, max_code_length=None,
+                  binary_rle=False, mode='text', stats=None, seekable=False):
+    if stats is None:
+        stats = CompressionStats()
+    streaming = streaming or workers > 1 or seekable
+    with open_input(input_file, mode, streaming) as text:
+        if streaming:
+            # Block container: blocks carry their own codebooks, so tree_file is not used
+            with open(output_file, 'wb') as dst:
+                text_length, compressed_length = compress_stream(text, dst, block_size, workers,
+                                                                 max_code_length, mode, stats, seekable)
+            report_compression(text_length * 8, compressed_length * 8)
+            return
+
+        # Huffman Coding
+        with stats.stage('build_huffman_tree', len(text)):
+            root = build_huffman_tree_linear(text)
+        with stats.stage('build_codebook'):
+            if canonical or max_code_length is not None:
+                code_lengths = limited_code_lengths(root, max_code_length)
+                huffman_codes = canonical_huffman_codes(code_lengths)
+            else:
+                huffman_codes = generate_huffman_codes(root)
+        stats.maximum('alphabet_size', len(huffman_codes))
+        stats.maximum('max_code_length', max(map(len, huffman_codes.values()), default=0))
+
+        with stats.stage('huffman_encode', len(text)) as record:
+            if packed and not binary_rle:
+                # Bit-packed: the encoded bits never exist as a '0'/'1' string
+                output = huffman_encode_packed(text, Codebook(huffman_codes))
+                encoded_size = len(output)
+            else:
+                # Fused with RLE: the codes go straight into runs, which stream into the
+                # output file in chunks; the RLE and write time is counted here
+                with open(output_file, 'wb') as f:
+                    run_count, bit_length, output_length = write_runs(huffman_rle_runs(text, huffman_codes),
+                                                                      f, binary_rle)
+                encoded_size = (bit_length + 7) // 8
+                stats.add('rle_runs', run_count)
+                output = None
+            record['bytes_out'] = encoded_size
+        original_size = len(text) * 8  # Original in bits
+
+    # Run-Length Encoding
+    with stats.stage('rle_compress', encoded_size) as record:
+        if output is not None:
+            output_length = len(output)  # Text RLE is not applied to packed output
+        record['bytes_out'] = output_length
+
+    # Write Outputs
+    if canonical:
+        codebook = write_codebook_header(code_lengths)
+    else:
+        codebook = str(huffman_codes).encode('utf-8')
+    with stats.stage('write', output_length + len(codebook)):
+        if output is not None:
+            with open(output_file, 'wb') as f:
+                f.write(output)
+        with open(tree_file, 'wb') as f:
+            f.write(codebook)
+
+    # Compression Ratio: exact bytes written, codebook included
+    compressed_size = (output_length + len(codebook)) * 8
+    report_compression(original_size, compressed_size)
+    if max_code_length is not None:
+        cost = length_limit_cost(huffman_frequencies(root), huffman_code_lengths(root), code_lengths)
+        print(f"Length-Limit Cost (max {max_code_length} bits): {cost:.2f}%")
+
 # Decompression Function
-def decompress_file(compressed_file, tree_file, output_file):
-    # Read the compressed file
-    with open(compressed_file, 'r') as f:
-        rle_data = f.read()
+def decompress_file(compressed_file, tree_file, output_file, packed=False, engine='table', canonical=False,
+                    streaming=False, workers=1, binary_rle=False, mode='text', stats=None):
+    if stats is None:
+        stats = CompressionStats()
+    if streaming or workers > 1:
+        # Containers record their own mode
+        with open(compressed_file, 'rb') as src:
+            output_mode = 'wb' if container_mode(src.read(len(CONTAINER_MAGIC))) == 'bytes' else 'w'
+            src.seek(0)
+            with open(output_file, output_mode) as dst:
+                decompress_stream(src, dst, workers, stats)
+        print(f"Decompression complete. Output saved to {output_file}.")
+        return
 
     # Read the Huffman tree
-    with open(tree_file, 'r') as f:
-        huffman_codes = eval(f.read())  # Convert string back to dictionary (use with trusted input only)
+    with stats.stage('read_codebook'):
+        if canonical:
+            with open(tree_file, 'rb') as f:
+                code_lengths, _ = read_codebook_header(f.read(), byte_symbols=mode == 'bytes')
+            huffman_codes = canonical_huffman_codes(code_lengths)
+        else:
+            with open(tree_file, 'r', encoding='utf-8') as f:
+                huffman_codes = eval(f.read())  # Convert string back to dictionary (use with trusted input only)
+
+        # RLE input is decoded run by run on the array tree. Packed input is table-driven
+        # by default; 'tree' walks the rebuilt Huffman tree bit by bit
+        if engine not in ('table', 'tree'):
+            raise ValueError(f"Unknown decode engine: {engine!r}")
+        run_input = binary_rle or not packed
+        if engine == 'table' and not run_input:
+            decode_table = build_decode_table(huffman_codes)
+        else:
+            huffman_tree = rebuild_huffman_tree(huffman_codes, compact=True)
 
-    # Rebuild the Huffman tree
-    huffman_tree = rebuild_huffman_tree(huffman_codes)
+    # Read the compressed file
+    with open(compressed_file, 'rb') as f:
+        data = f.read()
 
-    # Step 1: Decode RLE
-    binary_string = rle_decompress(rle_data)
+    # Step 1: Decode RLE into runs; the bits they stand for are never expanded
+    with stats.stage('rle_decompress', len(data)) as record:
+        if binary_rle:
+            encoded = decode_runs(data)
+        elif packed:
+            encoded = data
+        else:
+            encoded = parse_runs(data.decode('ascii'))
+        encoded_size = (sum(encoded) + 7) // 8 if run_input else len(encoded)
+        record['bytes_out'] = encoded_size
 
     # Step 2: Decode Huffman
-    original_text = huffman_decode(binary_string, huffman_tree)
+    with stats.stage('huffman_decode', encoded_size) as record:
+        if run_input:
+            original_text = huffman_decode_runs(encoded, huffman_tree)
+        elif engine == 'table':
+            original_text = huffman_decode_table(encoded, decode_table)
+        else:
+            original_text = huffman_decode_packed(encoded, huffman_tree)
+        record['bytes_out'] = len(original_text)
 
     # Write the decompressed data to the output file
-    with open(output_file, 'w') as f:
-        f.write(original_text)
+    if mode == 'bytes':
+        with open(output_file, 'wb') as f:
+            f.write(original_text or b'')
+    else:
+        with open(output_file, 'w') as f:
+            f.write(original_text)
 
     print(f"Decompression complete. Output saved to {output_file}.")
 
 # Example Usage
 if __name__ == "__main__":
     # Compress
-    compress_file('input.txt', 'compressed.txt', 'huffman_tree.txt')
+    stats = CompressionStats()
+    compress_file('input.txt', 'compressed.txt', 'huffman_tree.txt', stats=stats)
+    print(stats.summary())
 
     # Decompress
     decompress_file('compressed.txt', 'huffman_tree.txt', 'decompressed.txt')
\ No newline at end of file
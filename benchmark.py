@@ -0,0 +1,189 @@
+import argparse
+import io
+import json
+import platform
+import random
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import Logic
+
+try:
+    import resource
+except ImportError:  # Unix only; peak RSS comes from psutil, if installed, elsewhere
+    resource = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Synthetic corpora are generated from a fixed seed, so every run sees the same input
+CORPORA = ('english', 'logs', 'low_entropy', 'random', 'long_runs')
+DEFAULT_SIZES = ('1K', '64K', '1M')
+SIZE_UNITS = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+SEED = 1234
+
+WORDS = ("the of and to in is was that for it with as his on be at by had are but from or have an they which "
+         "one you were all her she there would their we him been has when who will no more if out so up said "
+         "what its about than into them can only other time new some could these two may first then do any "
+         "like my now over such our man me even most made after also did many before must through back years "
+         "where much your way well down should because each just those people how too little state good very "
+         "make world still own see men work long get here between both life being under never day same another "
+         "know while last might us great old year off come since against go came right used take three").split()
+
+LOG_LEVELS = ('INFO', 'INFO', 'INFO', 'DEBUG', 'WARN', 'ERROR')
+LOG_PATHS = ('/api/users', '/api/orders', '/health', '/static/app.js', '/login', '/api/search')
+
+def parse_size(size):
+    size = size.strip().upper()
+    if size[-1] in SIZE_UNITS:
+        return int(size[:-1]) * SIZE_UNITS[size[-1]]
+    return int(size)
+
+# Step 1: Generate a synthetic corpus of exactly `size` characters
+def generate_corpus(kind, size, seed=SEED):
+    rng = random.Random(seed)
+    pieces = []
+    length = 0
+    while length < size:
+        if kind == 'english':
+            sentence = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 20)))
+            piece = sentence.capitalize() + rng.choice('.,;!?') + ' '
+        elif kind == 'logs':
+            piece = (f"2024-05-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:"
+                     f"{rng.randint(0, 59):02d}Z {rng.choice(LOG_LEVELS)} GET {rng.choice(LOG_PATHS)} "
+                     f"status={rng.choice((200, 200, 200, 304, 404, 500))} ms={rng.randint(1, 900)}\n")
+        elif kind == 'low_entropy':
+            piece = ''.join(rng.choices('aaaaaaaabbbc', k=4096))
+        elif kind == 'random':
+            piece = ''.join(map(chr, rng.choices(range(256), k=4096)))
+        elif kind == 'long_runs':
+            piece = ''.join(rng.choice(string.ascii_lowercase[:4]) * rng.randint(50, 5000) for _ in range(16))
+        else:
+            raise ValueError(f"Unknown corpus: {kind!r}")
+        pieces.append(piece)
+        length += len(piece)
+    return ''.join(pieces)[:size]
+
+# Peak resident set size of this process in KiB, or None when it cannot be measured
+def peak_rss_kb():
+    if resource is not None:
+        # ru_maxrss is in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        peak = getattr(memory, 'peak_wset', None)  # Windows only
+        return (peak if peak is not None else memory.rss) // 1024
+    return None
+
+# Run `function` `repeat` times and keep the fastest wall-clock time
+def time_stage(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+# Step 2: Time every stage of the Logic.py pipeline on one corpus
+def benchmark_case(kind, size, repeat=3):
+    text = generate_corpus(kind, size)
+    megabytes = len(text.encode('utf-8')) / 1e6
+    stages = {}
+
+    def record(name, function):
+        result, seconds = time_stage(function, repeat)
+        stages[name] = {'seconds': seconds, 'mb_per_s': megabytes / seconds if seconds else None}
+        return result
+
+    def verify(name, decoded_text):
+        if decoded_text != text:
+            raise AssertionError(f"{name} round trip failed for {kind} at {size} characters")
+
+    # Reference string pipeline
+    root = record('build_huffman_tree', lambda: Logic.build_huffman_tree(text))
+    huffman_codes = record('generate_huffman_codes', lambda: Logic.generate_huffman_codes(root))
+    encoded_text = record('huffman_encode', lambda: Logic.huffman_encode(text, huffman_codes))
+    rle_data = record('rle_compress', lambda: Logic.rle_compress(encoded_text))
+    binary_string = record('rle_decompress', lambda: Logic.rle_decompress(rle_data))
+    verify('huffman_decode', record('huffman_decode', lambda: Logic.huffman_decode(binary_string, root)))
+
+    # Default engines: what the containers and decompress_file actually run
+    linear_root = record('build_huffman_tree_linear', lambda: Logic.build_huffman_tree_linear(text))
+    codebook = Logic.Codebook.from_code_lengths(Logic.huffman_code_lengths(linear_root))
+    packed = record('codebook_encode', lambda: codebook.encode(text))
+    decode_table = Logic.build_decode_table(codebook.codes)
+    verify('huffman_decode_table',
+           record('huffman_decode_table', lambda: Logic.huffman_decode_table(packed, decode_table)))
+    runs = record('huffman_rle_runs', lambda: list(Logic.huffman_rle_runs(text, codebook)))
+    tree = Logic.rebuild_huffman_tree(codebook.codes, compact=True)
+    verify('huffman_decode_runs', record('huffman_decode_runs', lambda: Logic.huffman_decode_runs(runs, tree)))
+
+    # The ratio is measured on the block container at the default block size, i.e. the bytes that would hit disk
+    def compress():
+        dst = io.BytesIO()
+        Logic.compress_stream(io.StringIO(text), dst, Logic.DEFAULT_BLOCK_SIZE)
+        return dst.getvalue()
+
+    def decompress():
+        dst = io.StringIO()
+        Logic.decompress_stream(io.BytesIO(container), dst)
+        return dst.getvalue()
+
+    container = record('compress_stream', compress)
+    verify('decompress_stream', record('decompress_stream', decompress))
+    compressed_size = len(container)
+    original_size = len(text.encode('utf-8'))
+    return {
+        'corpus': kind,
+        'size': size,
+        'original_bytes': original_size,
+        'compressed_bytes': compressed_size,
+        'ratio': compressed_size / original_size if original_size else None,
+        'stages': stages,
+        # Every case runs in a fresh process, so this is its own peak
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+# Step 3: Run every (corpus, size) case, each in its own process for a clean peak RSS
+def run_benchmark(corpora=CORPORA, sizes=DEFAULT_SIZES, repeat=3):
+    cases = [(kind, parse_size(size)) for size in sizes for kind in corpora]
+    results = []
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for kind, size in cases:
+            results.append(pool.submit(benchmark_case, kind, size, repeat).result())
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': Logic.np.__version__ if Logic.np is not None else None,
+        'repeat': repeat,
+        'results': results,
+    }
+
+def print_summary(report, out=sys.stdout):
+    for result in report['results']:
+        stages = ', '.join(f"{name} {stage['mb_per_s']:.2f}" for name, stage in result['stages'].items()
+                           if stage['mb_per_s'] is not None)
+        peak_rss = 'n/a' if result['peak_rss_kb'] is None else f"{result['peak_rss_kb'] / 1024:.1f} MiB"
+        print(f"{result['corpus']:>12} {result['size']:>11} B  ratio {result['ratio']:.3f}  "
+              f"peak RSS {peak_rss}  MB/s: {stages}", file=out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every stage of the Logic.py pipeline.")
+    parser.add_argument('--corpora', default=','.join(CORPORA), help="comma-separated corpus kinds")
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help="comma-separated sizes, e.g. 1K,1M,1G")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage; the fastest is kept")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.corpora.split(','), args.sizes.split(','), args.repeat)
+    print_summary(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Command-line entry point:
+#   python cli.py compress   PATHS... [-o DIR] [--workers N] [--mode bytes|text] [--seekable]
+#   python cli.py decompress PATHS... [-o DIR] [--workers N]
+#   python cli.py bench      [benchmark.py options]
+# PATHS may be files, directories (walked recursively) or glob patterns. All
+# files are handled in one process pool, so interpreter startup is paid once.
+# Logic and benchmark are imported inside the commands, and the UI modules
+# (matplotlib, networkx, streamlit, tkinter) are never imported.
+SUFFIX = '.hrc'
+
+# Step 1: Expand files, directories and globs into (path, path relative to its argument) pairs
+def collect_files(paths, decompress=False):
+    files = []
+    for path in paths:
+        matches = glob.glob(path, recursive=True) if glob.has_magic(path) else [path]
+        if not matches:
+            raise FileNotFoundError(f"No files match {path!r}")
+        for match in sorted(matches):
+            if os.path.isdir(match):
+                for root, dirs, names in os.walk(match):
+                    dirs.sort()
+                    files += [(os.path.join(root, name), os.path.relpath(os.path.join(root, name), match))
+                              for name in sorted(names)]
+            else:
+                files.append((match, os.path.basename(match)))
+    # Containers are what decompress reads and what compress writes, so compress skips them
+    return [(path, relative) for path, relative in files if path.endswith(SUFFIX) == decompress]
+
+def output_path(path, relative, output_dir, decompress):
+    target = os.path.join(output_dir, relative) if output_dir else path
+    if not decompress:
+        return target + SUFFIX
+    return target[:-len(SUFFIX)] if target.endswith(SUFFIX) else target + '.out'
+
+# Step 2: One file per task; returns (input bytes, output bytes)
+def compress_one(path, target, mode, block_size, max_code_length, seekable):
+    import Logic
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    with Logic.open_input(path, mode, streaming=True) as src, open(target, 'wb') as dst:
+        _, compressed_length = Logic.compress_stream(src, dst, block_size, 1, max_code_length, mode,
+                                                     index=seekable)
+    return os.path.getsize(path), compressed_length
+
+def decompress_one(path, target):
+    import Logic
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    with open(path, 'rb') as src:
+        text_mode = Logic.container_mode(src.read(len(Logic.CONTAINER_MAGIC))) == 'text'
+        src.seek(0)
+        with open(target, 'w' if text_mode else 'wb') as dst:
+            Logic.decompress_stream(src, dst)
+    return os.path.getsize(path), os.path.getsize(target)
+
+def run_task(function, path, *args):
+    try:
+        return path, function(path, *args), None
+    except (OSError, ValueError) as error:
+        return path, None, str(error)
+
+# Step 3: Run every file through a worker pool and print the aggregate throughput
+def run_files(tasks, workers):
+    start = time.perf_counter()
+    if workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_task, *zip(*tasks), chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        results = [run_task(*task) for task in tasks]
+    elapsed = time.perf_counter() - start
+
+    failures = [(path, error) for path, _, error in results if error is not None]
+    sizes = [result for _, result, error in results if error is None]
+    for path, error in failures:
+        print(f"error: {path}: {error}", file=sys.stderr)
+    bytes_in = sum(size_in for size_in, _ in sizes)
+    bytes_out = sum(size_out for _, size_out in sizes)
+    ratio = bytes_out / bytes_in * 100 if bytes_in else 0.0
+    throughput = bytes_in / elapsed / 1e6 if elapsed else 0.0
+    print(f"{len(sizes)} file(s), {bytes_in} B in, {bytes_out} B out ({ratio:.2f}%), "
+          f"{elapsed:.3f} s, {throughput:.2f} MB/s")
+    return 1 if failures else 0
+
+def compress_command(args):
+    tasks = [(compress_one, path, output_path(path, relative, args.output_dir, False), args.mode,
+              args.block_size, args.max_code_length, args.seekable)
+             for path, relative in collect_files(args.paths)]
+    return run_files(tasks, args.workers)
+
+def decompress_command(args):
+    tasks = [(decompress_one, path, output_path(path, relative, args.output_dir, True))
+             for path, relative in collect_files(args.paths, decompress=True)]
+    return run_files(tasks, args.workers)
+
+def bench_command(args):
+    import benchmark
+    return benchmark.main(args.bench_args)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Huffman + RLE compression for files and directories.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compress = commands.add_parser('compress', help=f"compress files into {SUFFIX} block containers")
+    compress.add_argument('paths', nargs='+', help="files, directories or glob patterns")
+    compress.add_argument('--mode', choices=('bytes', 'text'), default='bytes',
+                          help="bytes works on any file; text reads UTF-8 characters")
+    compress.add_argument('--block-size', type=int, default=1 << 20, help="block size in bytes (or characters)")
+    compress.add_argument('--max-code-length', type=int, help="cap Huffman code lengths")
+    compress.add_argument('--seekable', action='store_true', help="write a block index for read_range")
+    compress.set_defaults(handler=compress_command)
+
+    decompress = commands.add_parser('decompress', help=f"restore files from {SUFFIX} block containers")
+    decompress.add_argument('paths', nargs='+', help="files, directories or glob patterns")
+    decompress.set_defaults(handler=decompress_command)
+
+    for command in (compress, decompress):
+        command.add_argument('-o', '--output-dir', help="write outputs here, keeping relative paths")
+        command.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="worker processes")
+
+    # Everything after 'bench' is passed on to benchmark.py
+    bench = commands.add_parser('bench', help="run benchmark.py", add_help=False)
+    bench.set_defaults(handler=bench_command)
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command != 'bench' and extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.bench_args = extra
+    try:
+        return args.handler(args) or 0
+    except FileNotFoundError as error:
+        parser.error(str(error))
+
+if __name__ == "__main__":
+    sys.exit(main())
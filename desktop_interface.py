@@ -1,161 +1,89 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import time
-import heapq
-from collections import Counter
-import math
+import threading
+import queue
+import shutil
+import tempfile
+import io
 import matplotlib.pyplot as plt
 import networkx as nx
 import os
+from Logic import (CompressionStats, CompressionCancelled, ResultCache, compress_stream, open_input, container_mode,
+                   read_block, read_codebook_header, canonical_huffman_codes, huffman_tree_view, tree_view_position,
+                   CONTAINER_MAGIC, BLOCK_HUFFMAN, BLOCK_HUFFMAN_RLE)
 
 
-# Define the Huffman Node class
-class HuffmanNode:
-    def _init_(self, char, freq):
-        self.char = char
-        self.freq = freq
-        self.left = None
-        self.right = None
-
-    def _lt_(self, other):
-        return self.freq < other.freq
-
-
-# Huffman Tree and Encoding Logic
-def build_huffman_tree(text):
-    freq = Counter(text)
-    heap = [HuffmanNode(char, freq) for char, freq in freq.items()]
-    heapq.heapify(heap)
-
-    while len(heap) > 1:
-        left = heapq.heappop(heap)
-        right = heapq.heappop(heap)
-        merged = HuffmanNode(None, left.freq + right.freq)
-        merged.left = left
-        merged.right = right
-        heapq.heappush(heap, merged)
-
-    return heap[0]
-
-
-def generate_huffman_codes(root, code='', huffman_codes={}):
-    if root is None:
-        return
-    if root.char is not None:
-        huffman_codes[root.char] = code
-    generate_huffman_codes(root.left, code + '0', huffman_codes)
-    generate_huffman_codes(root.right, code + '1', huffman_codes)
-    return huffman_codes
-
-
-def huffman_encode(text, huffman_codes):
-    return ''.join(huffman_codes[char] for char in text)
-
-# Run-Length Encoding Logic
-def rle_compress(binary_string):
-    compressed = []
-    count = 1
-    for i in range(1, len(binary_string)):
-        if binary_string[i] == binary_string[i - 1]:
-            count += 1
-        else:
-            compressed.append(f"{count}:{binary_string[i - 1]}")
-            count = 1
-    compressed.append(f"{count}:{binary_string[-1]}")
-    return ','.join(compressed)
-
-
-def rle_decompress(rle_data):
-    decompressed = []
-    rle_pairs = rle_data.split(',')
-    for pair in rle_pairs:
-        count, bit = pair.split(':')
-        decompressed.append(bit * int(count))
-    return ''.join(decompressed)
-
-def rebuild_huffman_tree(huffman_codes):
-    root = HuffmanNode(None, 0)
-    for char, code in huffman_codes.items():
-        current_node = root
-        for bit in code:
-            if bit == '0':
-                if current_node.left is None:
-                    current_node.left = HuffmanNode(None, 0)
-                current_node = current_node.left
-            else:
-                if current_node.right is None:
-                    current_node.right = HuffmanNode(None, 0)
-                current_node = current_node.right
-        current_node.char = char
-    return root
-
-
-def huffman_decode(encoded_text, huffman_tree):
-    decoded_text = []
-    current_node = huffman_tree
-    for bit in encoded_text:
-        if bit == '0':
-            current_node = current_node.left
-        else:
-            current_node = current_node.right
-        if current_node.char is not None:
-            decoded_text.append(current_node.char)
-            current_node = huffman_tree
-    return ''.join(decoded_text)
-
-
-def compress_text(text):
-    start_time = time.time()
-
-# Huffman Encoding
-    root = build_huffman_tree(text)
-    huffman_codes = generate_huffman_codes(root)
-    encoded_text = huffman_encode(text, huffman_codes)
-
- # Run-Length Encoding
-    compressed_data = rle_compress(encoded_text)
-
-    original_size = len(text) * 8  # Original in bits
-    rle_pairs = compressed_data.split(',')
-    compressed_size = sum(math.ceil(math.log2(int(pair.split(':')[0]) + 1)) + 1 for pair in rle_pairs)
-
-    compression_ratio = (original_size - compressed_size) / original_size * 100
-    end_time = time.time()
-
-    return compressed_data, huffman_codes, root, compression_ratio, original_size, compressed_size, end_time - start_time
-
-
-def plot_compression_stats(original_size, compressed_size, compression_ratio):
-    fig, ax = plt.subplots()
-    labels = ['Original Size', 'Compressed Size']
-    sizes = [original_size, compressed_size]
-
-    ax.bar(labels, sizes, color=['blue', 'green'])
-    ax.set_title(f'Compression Ratio: {compression_ratio:.2f}%')
-    ax.set_ylabel('Size (bits)')
-
-    plt.show()
-
-
-def visualize_huffman_tree(root):
+# Huffman Tree Visualization
+# Draws a capped view of the codebook (see Logic.huffman_tree_view) and returns it as PNG bytes
+def render_huffman_tree(huffman_codes):
+    view = huffman_tree_view(huffman_codes)
     graph = nx.DiGraph()
-    pos = {}
-
-    add_edges(graph, root, pos)
+    graph.add_nodes_from(view)
+    graph.add_edges_from((prefix[:-1], prefix) for prefix in view if prefix)
+    pos = {prefix: tree_view_position(prefix) for prefix in view}
 
-    labels = {node: node.char if node.char else '' for node in pos}
-
-    plt.figure(figsize=(12, 8))
-    nx.draw(graph, pos, labels=labels, with_labels=True, node_size=500, node_color="black", font_color="white")
+    fig = plt.figure(figsize=(12, 8))
+    nx.draw(graph, pos, labels=view, with_labels=True, node_size=500, node_color="black", font_color="white")
     plt.title("Huffman Tree Visualization")
-    plt.show()
+    image = io.BytesIO()
+    fig.savefig(image, format='png')
+    plt.close(fig)
+    return image.getvalue()
+
+
+# Codebook of the first block of a container, or None when that block is stored raw
+def first_block_codes(path):
+    with open(path, 'rb') as src:
+        byte_symbols = container_mode(src.read(len(CONTAINER_MAGIC))) == 'bytes'
+        block_type, body = read_block(src)
+    if block_type not in (BLOCK_HUFFMAN, BLOCK_HUFFMAN_RLE):
+        return None
+    code_lengths, _ = read_codebook_header(body, byte_symbols=byte_symbols)
+    return canonical_huffman_codes(code_lengths)
 
 # Tkinter GUI
+# Number of bytes decoded for the on-screen preview
+PREVIEW_BYTES = 10000
+# Block size of the background compression; progress is reported once per block
+PROGRESS_BLOCK_SIZE = 1 << 20
+# How often the Tk main loop checks the worker thread for news, in ms
+POLL_INTERVAL = 50
+# Memory for rendered tree images, keyed by codebook
+TREE_IMAGE_CACHE_BYTES = 16 << 20
+
+
+# Runs off the Tk main thread: never touches widgets, only posts messages to `updates`
+def compress_in_background(file_path, output_path, updates, cancel_event):
+    def progress(done):
+        if cancel_event.is_set():
+            raise CompressionCancelled()
+        updates.put(('progress', done))
+
+    try:
+        stats = CompressionStats()
+        start_time = time.time()
+        with open_input(file_path, 'bytes', streaming=True) as src, open(output_path, 'wb') as dst:
+            original_length, compressed_length = compress_stream(src, dst, PROGRESS_BLOCK_SIZE, mode='bytes',
+                                                                 stats=stats, progress=progress)
+        updates.put(('done', (original_length, compressed_length, time.time() - start_time, stats)))
+    except CompressionCancelled:
+        updates.put(('cancelled', None))
+    except (OSError, ValueError) as error:
+        updates.put(('error', str(error)))
+
+
 class CompressionApp:
-    def _init_(self, root):
+    def __init__(self, root):
         self.root = root
         self.root.title("Data Compression Tool")
         self.root.state('zoomed')  # Make the window full-screen
+        self.file_path = None
+        self.output_path = None
+        self.worker = None
+        self.updates = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.tree_images = ResultCache(TREE_IMAGE_CACHE_BYTES)
 
         self.upload_button = tk.Button(self.root, text="Upload Text File", command=self.upload_file)
         self.upload_button.pack(pady=10)
@@ -163,6 +91,12 @@ class CompressionApp:
         self.compress_button = tk.Button(self.root, text="Compress", state=tk.DISABLED, command=self.compress)
         self.compress_button.pack(pady=10)
 
+        self.cancel_button = tk.Button(self.root, text="Cancel", state=tk.DISABLED, command=self.cancel)
+        self.cancel_button.pack(pady=10)
+
+        self.progress_bar = ttk.Progressbar(self.root, length=600, mode='determinate')
+        self.progress_bar.pack(pady=10)
+
         self.text_display = tk.Text(self.root, height=10, width=100)
         self.text_display.pack(pady=10)
 
@@ -172,51 +106,135 @@ class CompressionApp:
         self.stats_label = tk.Label(self.root, text="Compression Stats", font=("Helvetica", 14))
         self.stats_label.pack(pady=10)
 
-        self.stats_text = tk.Text(self.root, height=5, width=100)
+        self.stats_text = tk.Text(self.root, height=12, width=100)
         self.stats_text.pack(pady=10)
 
         self.save_button = tk.Button(self.root, text="Save Compressed File", state=tk.DISABLED, command=self.save_file)
         self.save_button.pack(pady=10)
 
+        self.tree_button = tk.Button(self.root, text="Show Huffman Tree", state=tk.DISABLED, command=self.show_tree)
+        self.tree_button.pack(pady=10)
+
     def upload_file(self):
-        file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
+        file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
         if file_path:
-            with open(file_path, 'r') as file:
-                self.text_display.delete(1.0, tk.END)
-                text = file.read()
-                self.text_display.insert(tk.END, text)
-                self.compress_button.config(state=tk.NORMAL)
+            # Compress the raw bytes (256-symbol alphabet); only the preview is read and decoded here
+            self.file_path = file_path
+            with open(file_path, 'rb') as file:
+                preview = file.read(PREVIEW_BYTES)
+            self.text_display.delete(1.0, tk.END)
+            self.text_display.insert(tk.END, preview.decode('utf-8', errors='replace'))
+            self.compress_button.config(state=tk.NORMAL)
 
     def compress(self):
-        text = self.text_display.get(1.0, tk.END).strip()
-        compressed_data, huffman_codes, root, compression_ratio, original_size, compressed_size, compression_time = compress_text(
-            text)
-
+        self.discard_output()
+        output = tempfile.NamedTemporaryFile(suffix='.hrc', delete=False)
+        output.close()
+        self.output_path = output.name
+        self.cancel_event.clear()
+        self.progress_bar.config(maximum=max(os.path.getsize(self.file_path), 1), value=0)
+        self.compress_button.config(state=tk.DISABLED)
+        self.upload_button.config(state=tk.DISABLED)
+        self.save_button.config(state=tk.DISABLED)
+        self.tree_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+
+        self.worker = threading.Thread(target=compress_in_background, daemon=True,
+                                       args=(self.file_path, self.output_path, self.updates, self.cancel_event))
+        self.worker.start()
+        self.root.after(POLL_INTERVAL, self.poll_worker)
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+
+    def poll_worker(self):
+        while True:
+            try:
+                kind, value = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                self.progress_bar.config(value=value)
+            else:
+                self.finish(kind, value)
+                return
+        self.root.after(POLL_INTERVAL, self.poll_worker)
+
+    def finish(self, kind, value):
+        self.worker = None
+        self.compress_button.config(state=tk.NORMAL)
+        self.upload_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        if kind == 'cancelled':
+            self.discard_output()
+            self.progress_bar.config(value=0)
+            return
+        if kind == 'error':
+            self.discard_output()
+            messagebox.showerror("Compression Failed", value)
+            return
+
+        original_length, compressed_length, compression_time, stats = value
+        original_size = original_length * 8  # Original in bits
+        compressed_size = compressed_length * 8
+        compression_ratio = (original_size - compressed_size) / original_size * 100 if original_size else 0.0
+
+        # Only a bounded preview goes into the widget; the full output stays on disk
+        with open(self.output_path, 'rb') as file:
+            preview = file.read(PREVIEW_BYTES)
         self.compressed_display.delete(1.0, tk.END)
-        self.compressed_display.insert(tk.END, compressed_data)
+        self.compressed_display.insert(tk.END, preview.hex(' '))
 
         self.stats_text.delete(1.0, tk.END)
-        stats = f"Original Size: {original_size} bits\n"
-        stats += f"Compressed Size: {compressed_size} bits\n"
-        stats += f"Compression Ratio: {compression_ratio:.4f}%\n"
-        stats += f"Compression Time: {compression_time:.6f} seconds"
-        self.stats_text.insert(tk.END, stats)
+        stats_report = f"Original Size: {original_size} bits\n"
+        stats_report += f"Compressed Size: {compressed_size} bits\n"
+        stats_report += f"Compression Ratio: {compression_ratio:.4f}%\n"
+        stats_report += f"Compression Time: {compression_time:.6f} seconds\n"
+        stats_report += stats.summary()
+        self.stats_text.insert(tk.END, stats_report)
 
         messagebox.showinfo("Compression Complete",
                             f"Compression completed successfully!\nTime: {compression_time:.6f} seconds")
 
         self.save_button.config(state=tk.NORMAL)
+        self.tree_button.config(state=tk.NORMAL)
+
+    # Shows the first block's codebook; images are cached, so repeated clicks skip the render
+    def show_tree(self):
+        huffman_codes = first_block_codes(self.output_path)
+        if huffman_codes is None:
+            messagebox.showinfo("Huffman Tree", "The first block is stored uncompressed, so it has no tree.")
+            return
+        key = ResultCache.key(repr(sorted(huffman_codes.items())), 'tree_view')
+        image = tk.PhotoImage(data=self.tree_images.get_or_compute(key, lambda: render_huffman_tree(huffman_codes)))
+        window = tk.Toplevel(self.root)
+        window.title("Huffman Tree Visualization")
+        label = tk.Label(window, image=image)
+        label.image = image  # Tk does not hold a reference to the image
+        label.pack()
+
+    def discard_output(self):
+        if self.output_path is not None and os.path.exists(self.output_path):
+            os.remove(self.output_path)
+        self.output_path = None
 
     def save_file(self):
-        compressed_data = self.compressed_display.get(1.0, tk.END).strip()
-        file_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text Files", "*.txt")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".hrc", filetypes=[("Compressed Files", "*.hrc")])
         if file_path:
-            with open(file_path, 'w') as file:
-                file.write(compressed_data)
+            shutil.copyfile(self.output_path, file_path)
             messagebox.showinfo("File Saved", f"Compressed file saved as {file_path}")
 
+    def close(self):
+        self.cancel_event.set()
+        if self.worker is not None:
+            self.worker.join()
+        self.discard_output()
+        self.root.destroy()
+
 
-if _name_ == "_main_":
+if __name__ == "__main__":
     root = tk.Tk()
     app = CompressionApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.protocol("WM_DELETE_WINDOW", app.close)
+    root.mainloop()
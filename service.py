@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit, parse_qs
+
+import Logic
+
+# Compression as a local HTTP service, stdlib only:
+#   POST /compress?mode=text|bytes   body: raw data       -> block container
+#   POST /decompress                 body: block container -> raw data
+#   GET  /health                                           -> "ok"
+# CPU work runs in a process pool. Requests up to SMALL_REQUEST bytes are
+# batched into one pool task, so many tiny messages do not pay one
+# inter-process round trip each.
+SMALL_REQUEST = 64 << 10
+MAX_BODY = 64 << 20
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+def compress_payload(data, mode='text'):
+    if mode not in ('text', 'bytes'):
+        raise ValueError(f"Unknown mode: {mode!r}")
+    src = io.BytesIO(data) if mode == 'bytes' else io.StringIO(data.decode('utf-8'))
+    dst = io.BytesIO()
+    Logic.compress_stream(src, dst, mode=mode)
+    return dst.getvalue()
+
+def decompress_payload(data, mode=None):
+    src = io.BytesIO(data)
+    text_mode = Logic.container_mode(data[:len(Logic.CONTAINER_MAGIC)]) == 'text'
+    dst = io.StringIO() if text_mode else io.BytesIO()
+    Logic.decompress_stream(src, dst)
+    return dst.getvalue().encode('utf-8') if text_mode else dst.getvalue()
+
+OPERATIONS = {'/compress': compress_payload, '/decompress': decompress_payload}
+
+# Runs in a worker process; errors are returned per job so one bad request does not fail its batch.
+# Malformed input can fail with more than ValueError (e.g. OverflowError on an oversized varint).
+def run_job(path, data, mode):
+    try:
+        return True, OPERATIONS[path](data, mode)
+    except ValueError as error:
+        return False, str(error)
+    except Exception as error:
+        return False, f"{type(error).__name__}: {error}"
+
+def run_batch(jobs):
+    return [run_job(*job) for job in jobs]
+
+class CompressionService:
+    def __init__(self, host='127.0.0.1', port=0, workers=None, max_concurrency=64, max_pending=256,
+                 batch_size=32, batch_delay=0.002, small_request=SMALL_REQUEST, max_body=MAX_BODY):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.small_request = small_request
+        self.max_body = max_body
+        # Requests past max_concurrency wait for a slot. `pending` counts requests that are
+        # running or waiting; past max_pending, new ones get a 503 before their body is read
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.pending = 0
+        self.batches = 0
+        self.queue = asyncio.Queue()
+        self.pool = None
+        self.server = None
+        self.batcher = None
+
+    async def start(self):
+        # Spawned, not forked: a forked worker would inherit open client sockets and keep them from closing
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        self.batcher = asyncio.create_task(self._run_batches())
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.batcher.cancel()
+        # Waiting for the workers to exit would block the event loop, so it happens on a thread
+        await asyncio.get_running_loop().run_in_executor(None, partial(self.pool.shutdown, cancel_futures=True))
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # Step 1: Queue a job; small ones go to the batcher, large ones straight to the pool
+    async def submit(self, path, data, mode='text'):
+        if len(data) <= self.small_request:
+            future = asyncio.get_running_loop().create_future()
+            self.queue.put_nowait(((path, data, mode), future))
+            return await future
+        return await asyncio.get_running_loop().run_in_executor(self.pool, run_job, path, data, mode)
+
+    # Step 2: Collect up to batch_size small jobs, waiting at most batch_delay after the first
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            self.batches += 1
+            try:
+                task = loop.run_in_executor(self.pool, run_batch, [job for job, _ in batch])
+            except Exception as error:  # e.g. a broken pool; fail this batch and keep batching
+                task = loop.create_future()
+                task.set_exception(error)
+            task.add_done_callback(lambda task, batch=batch: self._finish_batch(task, batch))
+
+    @staticmethod
+    def _finish_batch(task, batch):
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result()[index])
+
+    # Step 3: HTTP/1.1 with keep-alive; one request at a time per connection
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.strip() == 'HTTP/1.1')
+
+                length = int(headers.get('content-length', 0))
+                if length > self.max_body:
+                    await self._respond(writer, 413, b"Request body too large", keep_alive=False)
+                    break
+                if self.pending >= self.max_pending:
+                    # The body is never read, so the connection cannot be reused
+                    await self._respond(writer, 503, b"Too many pending requests", keep_alive=False)
+                    break
+                self.pending += 1
+                try:
+                    body = await reader.readexactly(length)
+                    async with self.slots:
+                        status, payload = await self._dispatch(method, target, body)
+                finally:
+                    self.pending -= 1
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == '/health':
+            return (200, b"ok") if method == 'GET' else (405, b"Use GET")
+        if url.path not in OPERATIONS:
+            return 404, b"Not found"
+        if method != 'POST':
+            return 405, b"Use POST"
+        mode = parse_qs(url.query).get('mode', ['text'])[0]
+        try:
+            ok, result = await self.submit(url.path, body, mode)
+        except Exception as error:  # The pool task itself failed, e.g. BrokenProcessPool
+            return 500, f"Compression worker failed: {type(error).__name__}".encode('utf-8')
+        return (200, result) if ok else (400, result.encode('utf-8'))
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive=True):
+        content_type = 'application/octet-stream' if status == 200 else 'text/plain; charset=utf-8'
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode('latin-1') + b"\r\n" + payload)
+        await writer.drain()
+
+async def serve(args):
+    service = CompressionService(args.host, args.port, args.workers, args.max_concurrency, args.max_pending,
+                                 args.batch_size, args.batch_delay / 1000)
+    async with service:
+        print(f"Compression service listening on http://{service.host}:{service.port}")
+        await service.server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Logic.py compression over HTTP on localhost.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--max-concurrency', type=int, default=64, help="requests processed at once")
+    parser.add_argument('--max-pending', type=int, default=256, help="running and waiting requests before answering 503")
+    parser.add_argument('--batch-size', type=int, default=32, help="small requests per pool task")
+    parser.add_argument('--batch-delay', type=float, default=2.0, help="ms to wait for a batch to fill")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import unittest
+import Logic
+
+def compress(chunks, mode='text'):
+    compressor = Logic.AdaptiveHuffmanCompressor(mode)
+    return [compressor.feed(chunk) for chunk in chunks] + [compressor.flush()]
+
+def decompress(data, mode='text', step=5):
+    decompressor = Logic.AdaptiveHuffmanDecompressor(mode)
+    pieces = [decompressor.feed(data[start:start + step]) for start in range(0, len(data), step)]
+    return pieces + [decompressor.flush()]
+
+class TestAdaptiveHuffman(unittest.TestCase):
+
+    def test_normal_case_round_trip(self):
+        """Test a text stream fed and decoded in small, unaligned pieces."""
+        text = "the quick brown fox jumps over the lazy dog\n" * 50
+        chunks = [text[start:start + 37] for start in range(0, len(text), 37)]
+        data = b''.join(compress(chunks))
+        self.assertEqual(''.join(decompress(data, step=3)), text)
+        self.assertLess(len(data), len(text))
+
+    def test_output_available_before_flush(self):
+        """Test that compressed bytes come out as input arrives, not at the end."""
+        outputs = compress(["abcdefgh" * 10, "more text"])
+        self.assertTrue(outputs[0].startswith(Logic.ADAPTIVE_MAGIC))
+        self.assertGreater(len(outputs[0]), len(Logic.ADAPTIVE_MAGIC))
+
+    def test_non_ascii_text_split_mid_character(self):
+        """Test UTF-8 text whose characters are split across decoder feeds."""
+        text = "Zoë paid €5 😀 " * 20
+        data = b''.join(compress([text]))
+        self.assertEqual(''.join(decompress(data, step=1)), text)
+
+    def test_bytes_mode_every_byte_value(self):
+        """Test a byte stream covering the whole alphabet."""
+        data = bytes(range(256)) * 3
+        compressed = b''.join(compress([data[:100], data[100:]], mode='bytes'))
+        self.assertEqual(b''.join(decompress(compressed, mode='bytes')), data)
+
+    def test_edge_case_empty_stream(self):
+        """Test a stream with no input at all."""
+        data = b''.join(compress([]))
+        self.assertEqual(''.join(decompress(data)), "")
+
+    def test_tree_keeps_sibling_property(self):
+        """Test that node weights never decrease with the node number."""
+        compressor = Logic.AdaptiveHuffmanCompressor('bytes')
+        compressor.feed(b"abracadabra alakazam" * 20)
+        tree = compressor.tree
+        weights = [tree.weight[node] for node in tree.by_number if node is not None]
+        self.assertEqual(weights, sorted(weights))
+
+    def test_error_case_truncated_stream(self):
+        """Test that a stream cut off before its end marker is rejected."""
+        data = b''.join(compress(["hello world"]))
+        decompressor = Logic.AdaptiveHuffmanDecompressor()
+        decompressor.feed(data[:-2])
+        with self.assertRaises(ValueError):
+            decompressor.flush()
+
+    def test_error_case_not_an_adaptive_stream(self):
+        """Test that data without the adaptive magic is rejected."""
+        with self.assertRaises(ValueError):
+            Logic.AdaptiveHuffmanDecompressor().feed(b"HRC1\x00")
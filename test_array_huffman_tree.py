@@ -0,0 +1,58 @@
+import unittest
+import Logic
+
+class TestArrayHuffmanTree(unittest.TestCase):
+
+    def setUp(self):
+        self.text = "the quick brown fox jumps over the lazy dog, again and again"
+        self.root = Logic.build_huffman_tree(self.text)
+        self.huffman_codes = Logic.generate_huffman_codes(self.root)
+        self.tree = Logic.rebuild_huffman_tree(self.huffman_codes, compact=True)
+
+    def test_matches_node_decoder(self):
+        """Test that the array tree decodes exactly like the node tree."""
+        encoded_text = Logic.huffman_encode(self.text, self.huffman_codes)
+        self.assertIsInstance(self.tree, Logic.ArrayHuffmanTree)
+        self.assertEqual(Logic.huffman_decode(encoded_text, self.tree),
+                         Logic.huffman_decode(encoded_text, self.root))
+        self.assertEqual(Logic.huffman_decode(encoded_text, self.tree), self.text)
+
+    def test_packed_decoding(self):
+        """Test decoding packed bits with the array tree."""
+        packed = Logic.huffman_encode_packed(self.text, self.huffman_codes)
+        self.assertEqual(Logic.huffman_decode_packed(packed, self.tree), self.text)
+
+    def test_from_nodes_and_codes(self):
+        """Test converting a node tree and reading the codebook back."""
+        tree = Logic.ArrayHuffmanTree.from_nodes(self.root)
+        self.assertEqual(tree.codes(), self.huffman_codes)
+        self.assertEqual(self.tree.codes(), self.huffman_codes)
+        self.assertEqual(len(tree), 2 * len(self.huffman_codes) - 1)
+
+    def test_invalid_code(self):
+        """Test that a path off the tree raises ValueError."""
+        tree = Logic.ArrayHuffmanTree({'a': '0', 'b': '10'})
+        with self.assertRaises(ValueError):
+            Logic.huffman_decode('11', tree)
+        with self.assertRaises(ValueError):
+            Logic.huffman_decode('0x', tree)
+
+    def test_single_symbol(self):
+        """Test a one-symbol codebook and byte symbols."""
+        tree = Logic.ArrayHuffmanTree({'a': '0'})
+        self.assertEqual(Logic.huffman_decode('000', tree), 'aaa')
+        data = bytes(range(256)) * 4
+        huffman_codes = Logic.generate_huffman_codes(Logic.build_huffman_tree(data))
+        tree = Logic.rebuild_huffman_tree(huffman_codes, compact=True)
+        self.assertEqual(Logic.huffman_decode(Logic.huffman_encode(data, huffman_codes), tree), data)
+
+    def test_smaller_than_nodes(self):
+        """Test that the arrays use less memory than the node objects they replace."""
+        import sys
+        tree = Logic.ArrayHuffmanTree.from_nodes(self.root)
+        array_bytes = sys.getsizeof(tree.left) + sys.getsizeof(tree.right) + sys.getsizeof(tree.symbols)
+        node_bytes = sys.getsizeof(self.root) * len(tree)
+        self.assertLess(array_bytes, node_bytes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import io
+import unittest
+from unittest import mock
+import benchmark
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_corpus_is_deterministic(self):
+        """Test that every corpus kind has the requested size and is identical across runs."""
+        for kind in benchmark.CORPORA:
+            corpus = benchmark.generate_corpus(kind, 5000)
+            self.assertEqual(len(corpus), 5000)
+            self.assertEqual(corpus, benchmark.generate_corpus(kind, 5000))
+
+    def test_parse_size(self):
+        """Test size suffixes."""
+        self.assertEqual(benchmark.parse_size("1K"), 1024)
+        self.assertEqual(benchmark.parse_size("2m"), 2 << 20)
+        self.assertEqual(benchmark.parse_size("300"), 300)
+
+    def test_benchmark_case_reports_every_stage(self):
+        """Test that a benchmark case reports throughput for every pipeline stage."""
+        result = benchmark.benchmark_case('logs', 2048, repeat=1)
+        self.assertEqual(list(result['stages']), ['build_huffman_tree', 'generate_huffman_codes', 'huffman_encode',
+                                                  'rle_compress', 'rle_decompress', 'huffman_decode',
+                                                  'build_huffman_tree_linear', 'codebook_encode',
+                                                  'huffman_decode_table', 'huffman_rle_runs', 'huffman_decode_runs',
+                                                  'compress_stream', 'decompress_stream'])
+        self.assertGreater(result['compressed_bytes'], 0)
+        if benchmark.resource is not None or benchmark.psutil is not None:
+            self.assertGreater(result['peak_rss_kb'], 0)
+
+    def test_without_resource_module(self):
+        """Test that peak RSS is reported as missing where neither resource nor psutil exists."""
+        with mock.patch.object(benchmark, 'resource', None), mock.patch.object(benchmark, 'psutil', None):
+            result = benchmark.benchmark_case('logs', 1024, repeat=1)
+        self.assertIsNone(result['peak_rss_kb'])
+        out = io.StringIO()
+        benchmark.print_summary({'results': [result]}, out)
+        self.assertIn("peak RSS n/a", out.getvalue())
+
+    def test_error_case_unknown_corpus(self):
+        """Test that an unknown corpus kind is rejected."""
+        with self.assertRaises(ValueError):
+            benchmark.generate_corpus('klingon', 10)
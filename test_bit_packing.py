@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+import Logic
+
+class TestBitPacking(unittest.TestCase):
+
+    def test_pack_unpack_round_trip(self):
+        """Test that packing and unpacking a bit string returns the same bits."""
+        for bits in ["", "0", "1", "10110", "11111111", "101100111"]:
+            self.assertEqual(Logic.unpack_bits(Logic.pack_bits(bits)), bits)
+
+    def test_pack_bits_layout(self):
+        """Test that bits are packed MSB-first and followed by the bit-length trailer."""
+        packed = Logic.pack_bits("101")
+        self.assertEqual(packed, bytes([0b10100000]) + (3).to_bytes(8, 'big'))
+
+    def test_encode_packed_matches_string_encoder(self):
+        """Test that the packed encoder produces the same bits as huffman_encode."""
+        text = "abracadabra " * 20000
+        root = Logic.build_huffman_tree(text)
+        huffman_codes = Logic.generate_huffman_codes(root)
+        packed = Logic.huffman_encode_packed(text, huffman_codes)
+        self.assertIsInstance(packed, bytes)
+        self.assertEqual(Logic.unpack_bits(packed), Logic.huffman_encode(text, huffman_codes))
+
+    def test_decode_packed_round_trip(self):
+        """Test Huffman decoding straight from a packed bitstream."""
+        text = "hello world"
+        root = Logic.build_huffman_tree(text)
+        huffman_codes = Logic.generate_huffman_codes(root)
+        packed = Logic.huffman_encode_packed(text, huffman_codes)
+        self.assertEqual(Logic.huffman_decode_packed(packed, root), text)
+
+    def test_error_case_truncated_stream(self):
+        """Test that a packed stream whose payload does not match its trailer is rejected."""
+        packed = Logic.pack_bits("10110011101")
+        with self.assertRaises(ValueError):
+            Logic.unpack_bits(packed[1:])
+
+    def test_compress_decompress_file_packed(self):
+        """Test the packed compress_file/decompress_file round trip on disk."""
+        text = "DAA Project\nData Compression\n" * 50
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ("in.txt", "out.bin", "tree.txt", "back.txt")]
+            with open(paths[0], 'w') as f:
+                f.write(text)
+            Logic.compress_file(paths[0], paths[1], paths[2], packed=True)
+            Logic.decompress_file(paths[1], paths[2], paths[3], packed=True)
+            with open(paths[3]) as f:
+                self.assertEqual(f.read(), text)
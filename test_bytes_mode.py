@@ -0,0 +1,64 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import Logic
+
+class TestBytesMode(unittest.TestCase):
+
+    DATA = bytes(range(256)) + b"\x00\xff" * 300 + "héllo wörld\n".encode('utf-8') * 20
+
+    def round_trip(self, data, block_size=None, engine='table', **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ("in.bin", "out.bin", "tree.bin", "back.bin")]
+            with open(paths[0], 'wb') as f:
+                f.write(data)
+            with contextlib.redirect_stdout(io.StringIO()):
+                Logic.compress_file(paths[0], paths[1], paths[2], mode='bytes',
+                                    block_size=block_size or Logic.DEFAULT_BLOCK_SIZE, **options)
+                Logic.decompress_file(paths[1], paths[2], paths[3], mode='bytes', engine=engine, **options)
+            with open(paths[3], 'rb') as f:
+                return f.read()
+
+    def test_normal_case_packed_canonical(self):
+        """Test a bytes-mode round trip through the packed canonical format."""
+        self.assertEqual(self.round_trip(self.DATA, packed=True, canonical=True), self.DATA)
+
+    def test_normal_case_text_rle(self):
+        """Test a bytes-mode round trip through the original RLE text format."""
+        self.assertEqual(self.round_trip(self.DATA), self.DATA)
+
+    def test_normal_case_streaming(self):
+        """Test a bytes-mode round trip through the block container."""
+        self.assertEqual(self.round_trip(self.DATA, streaming=True, block_size=100), self.DATA)
+
+    def test_normal_case_tree_engine(self):
+        """Test that the tree-walk decoder returns bytes for byte symbols."""
+        self.assertEqual(self.round_trip(self.DATA, packed=True, engine='tree'), self.DATA)
+
+    def test_edge_case_empty_file(self):
+        """Test compressing an empty binary file."""
+        self.assertEqual(self.round_trip(b"", packed=True, canonical=True), b"")
+        self.assertEqual(self.round_trip(b"", streaming=True), b"")
+
+    def test_codebook_header_byte_symbols(self):
+        """Test that byte symbols survive the canonical codebook header."""
+        code_lengths = {0: 2, 10: 2, 200: 2, 255: 2}
+        header = Logic.write_codebook_header(code_lengths)
+        self.assertEqual(Logic.read_codebook_header(header, byte_symbols=True)[0], code_lengths)
+
+    def test_container_records_mode(self):
+        """Test that byte containers use their own magic."""
+        compressed = io.BytesIO()
+        Logic.compress_stream(self.DATA, compressed, block_size=64, mode='bytes')
+        self.assertEqual(Logic.container_mode(compressed.getvalue()[:4]), 'bytes')
+        decompressed = io.BytesIO()
+        Logic.decompress_stream(io.BytesIO(compressed.getvalue()), decompressed)
+        self.assertEqual(decompressed.getvalue(), self.DATA)
+
+    def test_error_case_unknown_mode(self):
+        """Test that an unknown input mode is rejected."""
+        with self.assertRaises(ValueError):
+            with Logic.open_input(__file__, mode='words'):
+                pass
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+import Logic
+
+class TestCanonicalHuffman(unittest.TestCase):
+
+    def test_canonical_codes_from_lengths(self):
+        """Test that canonical codes are assigned in (length, symbol) order."""
+        code_lengths = {'a': 1, 'b': 3, 'c': 2, 'd': 3}
+        expected_codes = {'a': '0', 'c': '10', 'b': '110', 'd': '111'}
+        self.assertEqual(Logic.canonical_huffman_codes(code_lengths), expected_codes)
+
+    def test_canonical_codes_keep_tree_lengths(self):
+        """Test that canonical codes have the same lengths as the Huffman tree codes."""
+        text = "canonical huffman codes are deterministic"
+        root = Logic.build_huffman_tree(text)
+        code_lengths = Logic.huffman_code_lengths(root)
+        huffman_codes = Logic.canonical_huffman_codes(code_lengths)
+        self.assertEqual({char: len(code) for char, code in huffman_codes.items()}, code_lengths)
+        encoded_text = Logic.huffman_encode(text, huffman_codes)
+        decode_table = Logic.build_decode_table(huffman_codes)
+        self.assertEqual(Logic.huffman_decode_table(encoded_text, decode_table), text)
+
+    def test_header_round_trip(self):
+        """Test that the codebook header restores the code lengths, including non-ASCII symbols."""
+        code_lengths = {'\n': 3, ' ': 2, 'e': 2, 'é': 3, '€': 3, '😀': 3}
+        header = Logic.write_codebook_header(code_lengths)
+        self.assertIsInstance(header, bytes)
+        self.assertEqual(Logic.read_codebook_header(header), (code_lengths, len(header)))
+
+    def test_header_smaller_than_dict_dump(self):
+        """Test that the binary header is smaller than the str(dict) codebook."""
+        text = "DAA Project\nData Compression\n"
+        root = Logic.build_huffman_tree(text)
+        code_lengths = Logic.huffman_code_lengths(root)
+        header = Logic.write_codebook_header(code_lengths)
+        self.assertLess(len(header), len(str(Logic.canonical_huffman_codes(code_lengths))))
+
+    def test_error_case_invalid_lengths(self):
+        """Test that code lengths violating the Kraft inequality are rejected."""
+        with self.assertRaises(ValueError):
+            Logic.canonical_huffman_codes({'a': 1, 'b': 1, 'c': 1})
+
+    def test_error_case_truncated_header(self):
+        """Test that a truncated header is rejected."""
+        header = Logic.write_codebook_header({'a': 1, 'b': 2, 'c': 2})
+        with self.assertRaises(ValueError):
+            Logic.read_codebook_header(header[:-1])
+
+    def test_compress_decompress_file_canonical(self):
+        """Test the canonical compress_file/decompress_file round trip on disk."""
+        text = "DAA Project\nData Compression\n" * 10
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ("in.txt", "out.bin", "tree.bin", "back.txt")]
+            with open(paths[0], 'w') as f:
+                f.write(text)
+            Logic.compress_file(paths[0], paths[1], paths[2], packed=True, canonical=True)
+            Logic.decompress_file(paths[1], paths[2], paths[3], packed=True, canonical=True)
+            with open(paths[3]) as f:
+                self.assertEqual(f.read(), text)
@@ -0,0 +1,70 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+import cli
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.files = {"a.txt": b"hello hello hello\n" * 50, os.path.join("sub", "b.log"): bytes(range(256)) * 4,
+                      os.path.join("sub", "empty.bin"): b""}
+        for name, data in self.files.items():
+            path = os.path.join(self.tmp.name, "src", name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            status = cli.main(list(argv))
+        return status, out.getvalue()
+
+    def test_directory_round_trip_with_workers(self):
+        """Test compressing and restoring a directory tree through a worker pool."""
+        src, packed, restored = (os.path.join(self.tmp.name, name) for name in ("src", "packed", "restored"))
+        status, summary = self.run_cli('compress', src, '-o', packed, '--workers', '2')
+        self.assertEqual(status, 0)
+        self.assertIn("3 file(s)", summary)
+        self.assertTrue(os.path.exists(os.path.join(packed, "sub", "b.log" + cli.SUFFIX)))
+
+        status, _ = self.run_cli('decompress', packed, '-o', restored, '--workers', '2')
+        self.assertEqual(status, 0)
+        for name, data in self.files.items():
+            with open(os.path.join(restored, name), 'rb') as f:
+                self.assertEqual(f.read(), data)
+
+    def test_glob_and_text_mode(self):
+        """Test a glob pattern, text mode and in-place outputs."""
+        pattern = os.path.join(self.tmp.name, "src", "*.txt")
+        status, summary = self.run_cli('compress', pattern, '--mode', 'text', '--workers', '1')
+        self.assertEqual(status, 0)
+        self.assertIn("1 file(s)", summary)
+        container = os.path.join(self.tmp.name, "src", "a.txt" + cli.SUFFIX)
+        os.remove(os.path.join(self.tmp.name, "src", "a.txt"))
+        self.run_cli('decompress', container, '--workers', '1')
+        with open(os.path.join(self.tmp.name, "src", "a.txt"), 'rb') as f:
+            self.assertEqual(f.read(), self.files["a.txt"])
+
+    def test_error_case_corrupt_container(self):
+        """Test that a bad file is reported and sets a failing exit status."""
+        bad = os.path.join(self.tmp.name, "bad" + cli.SUFFIX)
+        with open(bad, 'wb') as f:
+            f.write(b"not a container")
+        status, summary = self.run_cli('decompress', bad, '--workers', '1')
+        self.assertEqual(status, 1)
+        self.assertIn("0 file(s)", summary)
+
+    def test_headless_run_skips_ui_imports(self):
+        """Test that the CLI never loads the plotting or UI libraries."""
+        code = ("import sys, cli; cli.main(['compress', sys.argv[1], '--workers', '1']); "
+                "print(sorted(m for m in ('matplotlib', 'networkx', 'streamlit', 'tkinter') if m in sys.modules))")
+        result = subprocess.run([sys.executable, '-c', code, os.path.join(self.tmp.name, "src")],
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(cli.__file__)))
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "[]")
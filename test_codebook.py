@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+import Logic
+
+# Codes of every length from 1 to `depth` bits, plus one more of `depth` bits
+def skewed_codes(symbols, depth):
+    codes = {symbol: '1' * i + '0' for i, symbol in enumerate(symbols[:depth])}
+    codes[symbols[depth]] = '1' * depth
+    return codes
+
+class TestCodebook(unittest.TestCase):
+
+    # Odd lengths leave one symbol outside the pairs; 1, 3 and 7 bits leave partial bytes
+    ODD_LENGTH_INPUTS = ("a", "abc", "abcab", "cabbaca" * 9 + "c")
+    CODES = {'a': '0', 'b': '10', 'c': '110', 'd': '111'}
+
+    def assertEncodes(self, codebook, text):
+        self.assertEqual(codebook.encode(text), Logic.huffman_encode_packed(text, codebook.codes))
+
+    def test_odd_lengths(self):
+        """Test inputs with an odd number of symbols, as text and as bytes."""
+        byte_codes = {ord(char): code for char, code in self.CODES.items()}
+        for text in self.ODD_LENGTH_INPUTS:
+            self.assertEncodes(Logic.Codebook(self.CODES), text)
+            self.assertEncodes(Logic.Codebook(byte_codes), text.encode('ascii'))
+
+    def test_carry_across_chunks(self):
+        """Test the partial byte carried from one pair-table chunk into the next."""
+        codebook = Logic.Codebook(self.CODES)
+        with mock.patch.object(Logic, 'PAIR_CHUNK_SIZE', 4):
+            for text in ("abcd" * 5, "dddd" + "a" * 7, "bcdab" * 3):
+                self.assertEncodes(codebook, text)
+        tree = Logic.rebuild_huffman_tree(self.CODES)
+        self.assertEqual(Logic.huffman_decode_packed(codebook.encode("dcba" * 100), tree), "dcba" * 100)
+
+    def test_codes_spanning_words(self):
+        """Test pairs up to 64 bits, which straddle the packer's 64-bit words."""
+        symbols = [chr(ord('A') + i) for i in range(Logic.PAIR_MAX_CODE_LENGTH + 1)]
+        codebook = Logic.Codebook(skewed_codes(symbols, Logic.PAIR_MAX_CODE_LENGTH))
+        self.assertIsNotNone(codebook.pair_table())
+        text = ''.join(symbols) * 3 + symbols[-1]
+        self.assertEncodes(codebook, text)
+
+    def test_pair_table_limits(self):
+        """Test that pair tables exist only for byte and ASCII alphabets with codes up to 32 bits."""
+        self.assertIsNotNone(Logic.Codebook(self.CODES).pair_table())
+        self.assertIsNotNone(Logic.Codebook({0: '0', 255: '1'}).pair_table())
+        self.assertIsNone(Logic.Codebook({'é': '0', 'b': '1'}).pair_table())
+        self.assertIsNone(Logic.Codebook({300: '0', 1: '1'}).pair_table())
+        symbols = [chr(ord('A') + i) for i in range(Logic.PAIR_MAX_CODE_LENGTH + 2)]
+        long_codes = skewed_codes(symbols, Logic.PAIR_MAX_CODE_LENGTH + 1)
+        codebook = Logic.Codebook(long_codes)
+        self.assertIsNone(codebook.pair_table())
+        self.assertEncodes(codebook, ''.join(symbols))
+        with mock.patch.object(Logic, 'np', None):
+            codebook = Logic.Codebook(self.CODES)
+            self.assertIsNone(codebook.pair_table())
+            self.assertEncodes(codebook, "abcdcba")
+
+    def test_string_path(self):
+        """Test that non-ASCII text and mixed inputs take the string join and still match."""
+        text = "héllo wörld ✓ " * 30
+        codebook = Logic.Codebook(Logic.generate_huffman_codes(Logic.build_huffman_tree_linear(text)))
+        self.assertEncodes(codebook, text)
+        self.assertEncodes(codebook, "")
+
+    def test_from_code_lengths(self):
+        """Test building a canonical codebook from code lengths."""
+        codebook = Logic.Codebook.from_code_lengths({'a': 1, 'b': 2, 'c': 2})
+        self.assertEqual(codebook.codes, {'a': '0', 'b': '10', 'c': '11'})
+        self.assertEqual(codebook.values, {'a': 0, 'b': 2, 'c': 3})
+        self.assertEqual(codebook.lengths, {'a': 1, 'b': 2, 'c': 2})
+        self.assertEqual(len(codebook), 3)
+
+    def test_unknown_symbol(self):
+        """Test that a symbol outside the codebook raises KeyError on every path."""
+        codebook = Logic.Codebook({'a': '0', 'b': '1'})
+        for text in ("abcab", "abé", "aac"):
+            with self.assertRaises(KeyError):
+                codebook.encode(text)
+        with self.assertRaises(KeyError):
+            Logic.Codebook({97: '0', 98: '1'}).encode(b"abc")
+
+    def test_generate_codes_does_not_share_state(self):
+        """Test that generate_huffman_codes starts from an empty codebook on every call."""
+        Logic.generate_huffman_codes(Logic.build_huffman_tree("xyz"))
+        self.assertEqual(set(Logic.generate_huffman_codes(Logic.build_huffman_tree("ab"))), {'a', 'b'})
+
+if __name__ == '__main__':
+    unittest.main()
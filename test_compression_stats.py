@@ -0,0 +1,74 @@
+import io
+import os
+import tempfile
+import unittest
+import Logic
+
+class TestCompressionStats(unittest.TestCase):
+
+    def test_stage_records_time_and_bytes(self):
+        """Test that a stage accumulates calls, time and byte counts."""
+        stats = Logic.CompressionStats()
+        for _ in range(2):
+            with stats.stage('encode', 10) as record:
+                record['bytes_out'] = 4
+        total = stats.stages['encode']
+        self.assertEqual((total['calls'], total['bytes_in'], total['bytes_out']), (2, 20, 8))
+        self.assertGreaterEqual(total['ns'], 0)
+        self.assertEqual([row['stage'] for row in stats.as_rows()], ['encode'])
+
+    def test_callback_sees_every_stage(self):
+        """Test that the callback is invoked once per stage with its record."""
+        seen = []
+        stats = Logic.CompressionStats(callback=lambda name, record: seen.append((name, record['bytes_in'])))
+        Logic.compress_block("abracadabra" * 50, stats=stats)
+        self.assertEqual([name for name, _ in seen],
+                         ['build_huffman_tree', 'build_codebook', 'huffman_encode', 'rle_compress'])
+        self.assertEqual(seen[0][1], 550)
+
+    def test_merge_adds_counts_and_keeps_maxima(self):
+        """Test merging stats collected separately."""
+        first, second = Logic.CompressionStats(), Logic.CompressionStats()
+        Logic.compress_block("ab" * 100, stats=first)
+        Logic.compress_block("abcdefgh" * 100, stats=second)
+        first.merge(second)
+        self.assertEqual(first.stages['huffman_encode']['calls'], 2)
+        self.assertEqual(first.maxima['alphabet_size'], 8)
+
+    def test_streaming_stats_match_with_workers(self):
+        """Test that worker processes report the same blocks and bytes as a serial run."""
+        text = "".join(f"line {i}: {'xyz' * (i % 5)}\n" for i in range(300))
+        results = []
+        for workers in (1, 2):
+            stats = Logic.CompressionStats()
+            Logic.compress_stream(io.StringIO(text), io.BytesIO(), block_size=500, workers=workers, stats=stats)
+            results.append(stats)
+        serial, parallel = results
+        self.assertEqual(parallel.counts, serial.counts)
+        self.assertEqual(parallel.maxima, serial.maxima)
+        self.assertEqual(parallel.stages['huffman_encode']['bytes_in'], len(text))
+        self.assertEqual(parallel.stages['huffman_encode']['calls'], serial.stages['huffman_encode']['calls'])
+
+    def test_decompress_stream_stats(self):
+        """Test that decompression reports the decoded size."""
+        text = "aaaaabbbbbcccc" * 100
+        compressed = io.BytesIO()
+        Logic.compress_stream(io.StringIO(text), compressed, block_size=256)
+        stats = Logic.CompressionStats()
+        Logic.decompress_stream(io.BytesIO(compressed.getvalue()), io.StringIO(), stats=stats)
+        self.assertEqual(stats.stages['huffman_decode']['bytes_out'], len(text))
+
+    def test_compress_file_stats(self):
+        """Test that compress_file reports every stage of the whole-file pipeline."""
+        text = "DAA Project\nData Compression\n" * 20
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ("in.txt", "out.bin", "tree.txt")]
+            with open(paths[0], 'w') as f:
+                f.write(text)
+            stats = Logic.CompressionStats()
+            Logic.compress_file(paths[0], paths[1], paths[2], stats=stats)
+            written = os.path.getsize(paths[1]) + os.path.getsize(paths[2])
+        self.assertEqual(set(stats.stages),
+                         {'build_huffman_tree', 'build_codebook', 'huffman_encode', 'rle_compress', 'write'})
+        self.assertEqual(stats.stages['write']['bytes_in'], written)
+        self.assertIn('alphabet_size', stats.summary())
@@ -0,0 +1,54 @@
+import unittest
+import Logic
+
+class TestHuffmanDecodeRuns(unittest.TestCase):
+
+    CODES = {'a': '0', 'b': '10', 'c': '110', 'd': '111'}
+
+    def test_round_trip(self):
+        """Test leading '1' runs, bulk repeats of both root chains and runs crossing codes."""
+        root = Logic.rebuild_huffman_tree(self.CODES)
+        tree = Logic.rebuild_huffman_tree(self.CODES, compact=True)
+        for text in ("d" * 1000, "ddda", "a" * 999 + "b", "bd" * 50 + "c", "cbadcbad", "b"):
+            runs = list(Logic.huffman_rle_runs(text, self.CODES))
+            self.assertEqual(Logic.huffman_decode_runs(runs, tree), text, msg=text[:10])
+            self.assertEqual(Logic.huffman_decode_runs(runs, root), text, msg=text[:10])
+
+    def test_byte_symbols(self):
+        """Test that byte symbols decode to bytes."""
+        tree = Logic.ArrayHuffmanTree({0: '0', 255: '1'})
+        self.assertEqual(Logic.huffman_decode_runs([3, 2, 1], tree), b"\x00" * 3 + b"\xff" * 2 + b"\x00")
+        self.assertEqual(Logic.huffman_decode_runs([], tree), '')
+
+    def test_long_runs_in_bulk(self):
+        """Test that a huge run of one code decodes without expanding its bits."""
+        tree = Logic.ArrayHuffmanTree({'a': '00', 'b': '01', 'c': '1'})
+        self.assertEqual(Logic.huffman_decode_runs([5, 5], tree), "aab" + "c" * 4)  # 00000 11111
+        decoded = Logic.huffman_decode_runs([2 * 10 ** 6 + 1, 10 ** 6 + 1], tree)
+        self.assertEqual(decoded, "a" * 10 ** 6 + "b" + "c" * 10 ** 6)
+
+    def test_parse_and_decode_runs(self):
+        """Test reading text and binary RLE back into runs."""
+        self.assertEqual(Logic.parse_runs("3:1,2:0,1:0"), [0, 3, 3])
+        self.assertEqual(Logic.parse_runs(""), [])
+        self.assertEqual(list(Logic.decode_runs(Logic.encode_runs([0, 3, 300, 1]))), [0, 3, 300, 1])
+        with self.assertRaises(ValueError):
+            Logic.parse_runs("3:2")
+        with self.assertRaises(ValueError):
+            Logic.parse_runs("-3:1")
+
+    def test_invalid_code(self):
+        """Test that a path off the tree raises ValueError."""
+        tree = Logic.ArrayHuffmanTree({'a': '0', 'b': '10'})
+        with self.assertRaises(ValueError):
+            Logic.huffman_decode_runs([0, 2], tree)
+
+    def test_truncated_code(self):
+        """Test that input ending partway through a code raises ValueError."""
+        tree = Logic.ArrayHuffmanTree({'a': '0', 'b': '10', 'c': '11'})
+        with self.assertRaises(ValueError):
+            Logic.huffman_decode_runs([1, 1, 1, 1], tree)  # '0' + '10' + '1'
+        self.assertEqual(Logic.huffman_decode_runs([1, 1, 1, 2], tree), "abc")
+
+if __name__ == '__main__':
+    unittest.main()
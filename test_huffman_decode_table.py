@@ -0,0 +1,88 @@
+import io
+import random
+import unittest
+import Logic
+
+class TestHuffmanTableDecoding(unittest.TestCase):
+
+    def encode(self, text):
+        root = Logic.build_huffman_tree(text)
+        huffman_codes = Logic.generate_huffman_codes(root, '', {})
+        return huffman_codes, Logic.huffman_encode(text, huffman_codes)
+
+    def test_normal_case_matches_tree_decoder(self):
+        """Test that the table decoder returns the same text as the tree walk."""
+        text = "the quick brown fox jumps over the lazy dog " * 40
+        huffman_codes, encoded_text = self.encode(text)
+        decode_table = Logic.build_decode_table(huffman_codes)
+        self.assertEqual(Logic.huffman_decode_table(encoded_text, decode_table), text)
+
+    def test_normal_case_packed_input(self):
+        """Test table decoding straight from a packed bitstream."""
+        text = "hello world"
+        huffman_codes, _ = self.encode(text)
+        packed = Logic.huffman_encode_packed(text, huffman_codes)
+        decode_table = Logic.build_decode_table(huffman_codes)
+        self.assertEqual(Logic.huffman_decode_table(packed, decode_table), text)
+
+    def test_edge_case_long_codes_use_secondary_tables(self):
+        """Test decoding codes longer than the primary table width."""
+        huffman_codes = {'a': '0', 'b': '10', 'c': '110', 'd': '1110', 'e': '11110', 'f': '11111'}
+        text = "abcdefedcbafff"
+        encoded_text = Logic.huffman_encode(text, huffman_codes)
+        decode_table = Logic.build_decode_table(huffman_codes, table_bits=2)
+        self.assertEqual(Logic.huffman_decode_table(encoded_text, decode_table), text)
+
+    def test_edge_case_short_code_after_long_code(self):
+        """Test that a short code right after a long one is read from the top-level table."""
+        huffman_codes = {'a': '0', 'b': '10', 'c': '110', 'd': '1110', 'e': '1111'}
+        decode_table = Logic.build_decode_table(huffman_codes, table_bits=2)
+        for text in ("ca", "ea", "dab", "cacbcdae" * 10):
+            encoded_text = Logic.huffman_encode(text, huffman_codes)
+            self.assertEqual(Logic.huffman_decode_table(encoded_text, decode_table), text)
+
+    def test_edge_case_codes_longer_than_default_table(self):
+        """Test codes past DECODE_TABLE_BITS at the default width, mixed with short codes."""
+        # Doubling frequencies give a maximally skewed tree: the rarest codes are 19 bits long
+        text = ''.join(chr(ord('a') + i) * (1 << i) for i in range(20))
+        text = ''.join(random.Random(7).sample(text, len(text)))
+        huffman_codes = Logic.canonical_huffman_codes(
+            Logic.huffman_code_lengths(Logic.build_huffman_tree_linear(text)))
+        self.assertGreater(max(map(len, huffman_codes.values())), Logic.DECODE_TABLE_BITS)
+        decode_table = Logic.build_decode_table(huffman_codes)
+        packed = Logic.huffman_encode_packed(text, huffman_codes)
+        self.assertEqual(Logic.huffman_decode_table(packed, decode_table), text)
+
+    def test_edge_case_long_codes_bytes_stream_round_trip(self):
+        """Test a bytes-mode container round trip of a skewed file with codes over 12 bits."""
+        rng = random.Random(3)
+        data = bytes(rng.choices(range(20), weights=[1 << i for i in range(20)], k=1 << 18)) + bytes(range(20))
+        dst = io.BytesIO()
+        Logic.compress_stream(io.BytesIO(data), dst, mode='bytes')
+        restored = io.BytesIO()
+        Logic.decompress_stream(io.BytesIO(dst.getvalue()), restored)
+        self.assertEqual(restored.getvalue(), data)
+
+    def test_edge_case_single_char(self):
+        """Test table decoding of a single repeated character."""
+        text = "xxxxxxxxxxxxxxxxxxxxxxx"
+        huffman_codes, encoded_text = self.encode(text)
+        decode_table = Logic.build_decode_table(huffman_codes)
+        self.assertEqual(Logic.huffman_decode_table(encoded_text, decode_table), text)
+
+    def test_edge_case_empty_string(self):
+        """Test table decoding of an empty bitstream."""
+        decode_table = Logic.build_decode_table({'a': '0', 'b': '1'})
+        self.assertEqual(Logic.huffman_decode_table("", decode_table), "")
+
+    def test_error_case_invalid_encoded_text(self):
+        """Test table decoding with a non-binary character in the input."""
+        decode_table = Logic.build_decode_table({'a': '0', 'b': '10', 'c': '11'})
+        with self.assertRaises(ValueError):
+            Logic.huffman_decode_table("0101a" * 10, decode_table)
+
+    def test_error_case_truncated_code(self):
+        """Test table decoding of a bitstream that stops in the middle of a code."""
+        decode_table = Logic.build_decode_table({'a': '0', 'b': '10', 'c': '11'})
+        with self.assertRaises(ValueError):
+            Logic.huffman_decode_table("0101", decode_table)
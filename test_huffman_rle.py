@@ -0,0 +1,81 @@
+import io
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+import Logic
+
+class TestFusedHuffmanRLE(unittest.TestCase):
+
+    # a ends in 0, d starts and ends in 1, c and e have runs inside the code
+    CODES = {'a': '0', 'b': '10', 'c': '1100', 'd': '111', 'e': '1101'}
+
+    # Runs merging across code boundaries: same-bit joins (aa, dd, ca), one-run
+    # codes absorbed whole (aaaa, dddd), alternating joins (ab, ea) and a leading '1'
+    BOUNDARY_INPUTS = ("aaaa", "dddd", "adda", "dbdb", "caac", "abab", "eaea", "ecdb", "d", "bacedaaddd" * 7)
+
+    def test_matches_separate_passes(self):
+        """Test that the fused runs equal RLE over the full Huffman bitstring at every kind of code boundary."""
+        for text in self.BOUNDARY_INPUTS:
+            encoded_text = Logic.huffman_encode(text, self.CODES)
+            runs = list(Logic.huffman_rle_runs(text, self.CODES))
+            self.assertEqual(runs, Logic.rle_runs(encoded_text, backend='python'), msg=text)
+            self.assertEqual(Logic.format_runs(runs), Logic.rle_compress(encoded_text, backend='python'))
+            self.assertEqual(list(Logic.huffman_rle_runs(text, Logic.Codebook(self.CODES))), runs)
+
+    def test_write_runs_across_chunks(self):
+        """Test that chunked text and binary RLE match the whole-list encoders, run parity included."""
+        runs = list(Logic.huffman_rle_runs("bacedaaddd" * 7, self.CODES))
+        for chunk_size in (1, 2, 3, len(runs)):
+            with mock.patch.object(Logic, 'RUN_CHUNK_SIZE', chunk_size):
+                for binary_rle, expected in ((False, Logic.format_runs(runs).encode('ascii')),
+                                             (True, Logic.encode_runs(runs))):
+                    dst = io.BytesIO()
+                    counts = Logic.write_runs(iter(runs), dst, binary_rle)
+                    self.assertEqual(dst.getvalue(), expected)
+                    self.assertEqual(counts, (len(runs), sum(runs), len(expected)))
+
+    def test_streaming_memory(self):
+        """Test that streaming the runs peaks well below holding them as a list."""
+        text = "bacedaaddd" * 20000
+        peaks = []
+        with mock.patch.object(Logic, 'RUN_CHUNK_SIZE', 1024):
+            for stream in (lambda: list(Logic.huffman_rle_runs(text, self.CODES)),
+                           lambda: Logic.write_runs(Logic.huffman_rle_runs(text, self.CODES), io.BytesIO(), True)):
+                tracemalloc.start()
+                stream()
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+        listed, streamed = peaks
+        self.assertLess(streamed * 4, listed)
+
+    def test_code_run_summary(self):
+        """Test the per-code run summaries."""
+        self.assertEqual(Logic.code_run_summary('0'), ('0', 1, (), '0'))
+        self.assertEqual(Logic.code_run_summary('1100010'), ('1', 2, (3, 1, 1), '0'))
+        with self.assertRaises(ValueError):
+            Logic.code_run_summary('')
+
+    def test_leading_one_and_empty(self):
+        """Test a stream starting with '1' and an empty input."""
+        huffman_codes = {'a': '10', 'b': '0'}
+        self.assertEqual(list(Logic.huffman_rle_runs("aab", huffman_codes)), [0, 1, 1, 1, 2])
+        self.assertEqual(list(Logic.huffman_rle_runs("", huffman_codes)), [])
+        self.assertEqual(Logic.format_runs([]), '')
+
+    def test_compress_file_round_trip(self):
+        """Test the whole-file pipeline with text and binary RLE."""
+        text = "aaaaaaaaaaaaaaaaaaaabbbbbbbbbbbbbbbbbbbbcccc" * 100
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, name) for name in ('in.txt', 'rle.bin', 'tree.txt', 'out.txt')]
+            with open(paths[0], 'w') as f:
+                f.write(text)
+            for binary_rle in (False, True):
+                Logic.compress_file(paths[0], paths[1], paths[2], canonical=True, binary_rle=binary_rle)
+                Logic.decompress_file(paths[1], paths[2], paths[3], canonical=True, binary_rle=binary_rle)
+                with open(paths[3]) as f:
+                    self.assertEqual(f.read(), text)
+
+if __name__ == '__main__':
+    unittest.main()
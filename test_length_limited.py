@@ -0,0 +1,53 @@
+import io
+import unittest
+import Logic
+
+class TestLengthLimitedCodes(unittest.TestCase):
+
+    # Fibonacci weights give the deepest possible Huffman tree
+    FIBONACCI = dict(zip("abcdefghijklmnop", [1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233, 377, 610, 987]))
+
+    def kraft_sum(self, code_lengths):
+        return sum(2 ** -length for length in code_lengths.values())
+
+    def test_normal_case_respects_limit(self):
+        """Test that package-merge caps every code at max_code_length and stays a complete code."""
+        code_lengths = Logic.length_limited_code_lengths(self.FIBONACCI, 6)
+        self.assertLessEqual(max(code_lengths.values()), 6)
+        self.assertEqual(self.kraft_sum(code_lengths), 1)
+        Logic.canonical_huffman_codes(code_lengths)  # Must be a valid prefix code
+
+    def test_normal_case_loose_limit_is_optimal(self):
+        """Test that a limit above the Huffman depth costs nothing."""
+        text = "length limited huffman codes"
+        root = Logic.build_huffman_tree(text)
+        frequencies = Logic.huffman_frequencies(root)
+        code_lengths = Logic.huffman_code_lengths(root)
+        limited = Logic.length_limited_code_lengths(frequencies, 15)
+        self.assertEqual(Logic.length_limit_cost(frequencies, code_lengths, limited), 0)
+
+    def test_normal_case_cost_is_reported(self):
+        """Test that a tight limit reports a positive ratio cost."""
+        root = Logic.build_huffman_tree("".join(char * count for char, count in self.FIBONACCI.items()))
+        self.assertEqual(max(Logic.huffman_code_lengths(root).values()), 15)
+        limited = Logic.limited_code_lengths(root, 5)
+        cost = Logic.length_limit_cost(Logic.huffman_frequencies(root), Logic.huffman_code_lengths(root), limited)
+        self.assertGreater(cost, 0)
+
+    def test_edge_case_single_symbol(self):
+        """Test that a single symbol gets a one-bit code."""
+        self.assertEqual(Logic.length_limited_code_lengths({'a': 7}, 4), {'a': 1})
+
+    def test_error_case_limit_too_small(self):
+        """Test that an alphabet larger than 2**max_code_length is rejected."""
+        with self.assertRaises(ValueError):
+            Logic.length_limited_code_lengths(self.FIBONACCI, 3)
+
+    def test_streaming_with_limit(self):
+        """Test a streaming round trip with length-limited block codebooks."""
+        text = "".join(char * count for char, count in self.FIBONACCI.items()) * 3
+        compressed = io.BytesIO()
+        Logic.compress_stream(io.StringIO(text), compressed, block_size=1000, max_code_length=7)
+        decompressed = io.StringIO()
+        Logic.decompress_stream(io.BytesIO(compressed.getvalue()), decompressed)
+        self.assertEqual(decompressed.getvalue(), text)
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+import Logic
+
+def encoded_bits(root, frequencies):
+    code_lengths = Logic.huffman_code_lengths(root)
+    return sum(frequencies[char] * length for char, length in code_lengths.items())
+
+class TestLinearHuffmanTree(unittest.TestCase):
+
+    # The ASCII fast path ends at '\x7f'; '\x80' and above must go through Counter
+    HISTOGRAM_INPUTS = (''.join(map(chr, range(128))) * 3, "\x7f\x80" * 5, b"\x00\xff\xff", bytearray(b"\x01" * 9), "")
+
+    # Tie-heavy histograms, where leaves and merged nodes often have equal weights
+    TIED_HISTOGRAMS = ({chr(ord('a') + i): 5 for i in range(8)},
+                       {'a': 1, 'b': 1, 'c': 2, 'd': 2, 'e': 4, 'f': 4},
+                       {'a': 1, 'b': 1, 'c': 1, 'd': 3, 'e': 3, 'f': 3, 'g': 9},
+                       {value: 1 + value % 3 for value in range(256)})
+
+    def test_symbol_frequencies(self):
+        """Test that the histogram matches Counter on both sides of the ASCII boundary and for bytes."""
+        for text in self.HISTOGRAM_INPUTS:
+            self.assertEqual(dict(Logic.symbol_frequencies(text)), dict(Counter(text)))
+
+    def test_symbol_frequencies_of_mapped_file(self):
+        """Test counting open_input's memoryview over a mapped file, with and without NumPy."""
+        data = b"\x00\x01\x01\x02\x02\x02" * 50 + bytes(range(256))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with open(path, 'wb') as f:
+                f.write(data)
+            with Logic.open_input(path, 'bytes') as mapped:
+                self.assertIsInstance(mapped, memoryview)
+                self.assertEqual(Logic.symbol_frequencies(mapped), dict(Counter(data)))
+                with mock.patch.object(Logic, 'np', None):
+                    self.assertEqual(Logic.symbol_frequencies(mapped), dict(Counter(data)))
+
+    def test_symbol_frequencies_without_numpy(self):
+        """Test the bytes.count fallback."""
+        with mock.patch.object(Logic, 'np', None):
+            for text in self.HISTOGRAM_INPUTS:
+                self.assertEqual(dict(Logic.symbol_frequencies(text)), dict(Counter(text)))
+
+    def test_optimal_like_heap_builder(self):
+        """Test that tied histograms cost as many bits as with the heap tree, and decode."""
+        for frequencies in self.TIED_HISTOGRAMS:
+            root = Logic.build_huffman_tree_linear(frequencies)
+            self.assertEqual(encoded_bits(root, frequencies),
+                             encoded_bits(Logic.build_huffman_tree(frequencies), frequencies))
+            text = [char for char, freq in frequencies.items() for _ in range(freq)]
+            huffman_codes = Logic.generate_huffman_codes(root)
+            decoded = Logic.huffman_decode(''.join(huffman_codes[char] for char in text), root)
+            self.assertEqual(list(decoded), text)
+
+    def test_ties_prefer_leaves(self):
+        """Test that ties go to leaves, giving the shallowest optimal tree."""
+        code_lengths = Logic.huffman_code_lengths(Logic.build_huffman_tree_linear(self.TIED_HISTOGRAMS[0]))
+        self.assertEqual(set(code_lengths.values()), {3})
+        # (a+b) ties with c and d; merging it first would give d a 1-bit code and a, b 3-bit ones
+        code_lengths = Logic.huffman_code_lengths(Logic.build_huffman_tree_linear({'a': 1, 'b': 1, 'c': 2, 'd': 2}))
+        self.assertEqual(code_lengths, {'a': 2, 'b': 2, 'c': 2, 'd': 2})
+
+    def test_deterministic_ties(self):
+        """Test that the same histogram gives the same codes whatever the symbol order."""
+        first = Logic.generate_huffman_codes(Logic.build_huffman_tree_linear("abcdabcd"))
+        second = Logic.generate_huffman_codes(Logic.build_huffman_tree_linear("dcbadcba"))
+        self.assertEqual(first, second)
+        self.assertEqual(first, Logic.generate_huffman_codes(Logic.build_huffman_tree_linear(
+            {'d': 2, 'c': 2, 'b': 2, 'a': 2})))
+
+    def test_small_alphabets(self):
+        """Test empty input and a single symbol."""
+        self.assertIsNone(Logic.build_huffman_tree_linear(""))
+        self.assertEqual(Logic.generate_huffman_codes(Logic.build_huffman_tree_linear(b"zzz")), {ord('z'): '0'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import tempfile
+import unittest
+import Logic
+
+class TestResultCache(unittest.TestCase):
+
+    def test_same_input_same_key(self):
+        """Test that keys depend on the input bytes and options only."""
+        key = Logic.ResultCache.key(b"hello", 'huffman')
+        self.assertEqual(Logic.ResultCache.key("hello", 'huffman'), key)
+        self.assertNotEqual(Logic.ResultCache.key(b"hello", 'rle'), key)
+        self.assertNotEqual(Logic.ResultCache.key(b"hellp", 'huffman'), key)
+
+    def test_get_or_compute_runs_once(self):
+        """Test that a cached result is not recomputed."""
+        cache = Logic.ResultCache()
+        calls = []
+        compute = lambda: calls.append(1) or {'a': '0', 'b': '1'}
+        for _ in range(3):
+            self.assertEqual(cache.get_or_compute('k', compute), {'a': '0', 'b': '1'})
+        self.assertEqual(len(calls), 1)
+
+    def test_lru_eviction_respects_memory_ceiling(self):
+        """Test that the least recently used entry is evicted at the ceiling."""
+        cache = Logic.ResultCache(max_bytes=250)
+        cache.put('a', b"x" * 100)
+        cache.put('b', b"y" * 100)
+        cache.get('a')
+        cache.put('c', b"z" * 100)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertLessEqual(cache.memory_bytes, 250)
+
+    def test_spill_to_disk(self):
+        """Test that evicted entries are served from the spill directory."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = Logic.ResultCache(max_bytes=150, spill_dir=tmp)
+            cache.put('a', "1" * 100)
+            cache.put('b', "0" * 100)
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.get('a'), "1" * 100)
+            # A second cache over the same directory sees the spilled result
+            self.assertEqual(Logic.ResultCache(spill_dir=tmp).get('a'), "1" * 100)
+
+    def test_missing_key_returns_default(self):
+        """Test a lookup of a key that was never stored."""
+        self.assertIsNone(Logic.ResultCache().get('missing'))
@@ -0,0 +1,44 @@
+import unittest
+import Logic
+
+@unittest.skipIf(Logic.np is None, "NumPy is not installed")
+class TestRLEBackends(unittest.TestCase):
+
+    def test_backends_agree_on_compress(self):
+        """Test that the NumPy and Python RLE encoders produce identical output."""
+        for binary_string in ["0", "1", "0001111000", "0101010101", "1" * 1000 + "0" * 3 + "1"]:
+            self.assertEqual(Logic.rle_compress(binary_string, backend='numpy'),
+                             Logic.rle_compress(binary_string, backend='python'))
+
+    def test_backends_agree_on_decompress(self):
+        """Test that the NumPy and Python RLE decoders produce identical output."""
+        for rle_string in ["3:0,2:1,4:0", "5:1", "1:0,1:1,1:0,1:1", "1000:1,3:0"]:
+            self.assertEqual(Logic.rle_decompress(rle_string, backend='numpy'),
+                             Logic.rle_decompress(rle_string, backend='python'))
+
+    def test_numpy_round_trip(self):
+        """Test a NumPy RLE round trip on a Huffman-encoded text."""
+        text = "aaaaaaaabbbbbbbbbbccd" * 50
+        root = Logic.build_huffman_tree(text)
+        encoded_text = Logic.huffman_encode(text, Logic.generate_huffman_codes(root, '', {}))
+        compressed = Logic.rle_compress(encoded_text, backend='numpy')
+        self.assertEqual(Logic.rle_decompress(compressed, backend='numpy'), encoded_text)
+
+    def test_error_case_invalid_characters(self):
+        """Test that the NumPy backend rejects non-binary input like the Python one."""
+        with self.assertRaises(ValueError):
+            Logic.rle_compress("00112AB00", backend='numpy')
+        with self.assertRaises(ValueError):
+            Logic.rle_decompress("3:0,2:1,invalid,4:0", backend='numpy')
+
+    def test_error_case_malformed_pairs(self):
+        """Test that both decoders reject malformed pairs with ValueError."""
+        for rle_string in ["1:1:1:1", "3:-1", "-3:1", "3:0,2", "99999999999999999999:1"]:
+            for backend in ('numpy', 'python'):
+                with self.assertRaises(ValueError, msg=(rle_string, backend)):
+                    Logic.rle_decompress(rle_string, backend=backend)
+
+    def test_error_case_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with self.assertRaises(ValueError):
+            Logic.rle_compress("0101", backend='fortran')
@@ -0,0 +1,66 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import Logic
+
+BACKENDS = ['python'] + (['numpy'] if Logic.np is not None else [])
+
+class TestBinaryRLE(unittest.TestCase):
+
+    def test_runs_alternate_starting_with_zero(self):
+        """Test that run lengths alternate and a leading '1' run gets a zero-length '0' run."""
+        for backend in BACKENDS:
+            self.assertEqual(Logic.rle_runs("0001111000", backend), [3, 4, 3])
+            self.assertEqual(Logic.rle_runs("1100", backend), [0, 2, 2])
+            self.assertEqual(Logic.rle_runs("", backend), [])
+
+    def test_runs_from_packed_bitstream(self):
+        """Test that packed input yields the same runs as the '0'/'1' string."""
+        binary_string = "1" * 70 + "0" * 3 + "1010" + "0" * 200
+        for backend in BACKENDS:
+            self.assertEqual(Logic.rle_runs(Logic.pack_bits(binary_string), backend),
+                             Logic.rle_runs(binary_string, backend))
+
+    def test_varint_encoding(self):
+        """Test that runs of 128 or more take a multi-byte varint."""
+        self.assertEqual(Logic.rle_compress_binary("0" * 3 + "1" * 4), bytes([3, 4]))
+        self.assertEqual(Logic.rle_compress_binary("0" * 300), bytes([0xAC, 0x02]))
+
+    def test_round_trip(self):
+        """Test that binary RLE decodes back to the same packed bitstream on every backend."""
+        for binary_string in ["", "0", "1", "0001111000", "1" * 1000 + "0"]:
+            for backend in BACKENDS:
+                compressed = Logic.rle_compress_binary(binary_string, backend)
+                self.assertEqual(Logic.unpack_bits(Logic.rle_decompress_binary(compressed, backend)),
+                                 binary_string)
+
+    def test_error_case_invalid_characters(self):
+        """Test that non-binary input is rejected."""
+        for backend in BACKENDS:
+            with self.assertRaises(ValueError):
+                Logic.rle_compress_binary("0012", backend)
+
+    def test_error_case_truncated_varint(self):
+        """Test that a varint cut off mid-value is rejected."""
+        with self.assertRaises(ValueError):
+            Logic.rle_decompress_binary(bytes([3, 0x80]), 'python')
+
+    def test_compress_file_reports_exact_size(self):
+        """Test that compress_file reports the bytes it actually wrote."""
+        text = "aaaaaaaaaaaaaaaaaaaabbbbbbbbbbbbc\n" * 30
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ("in.txt", "out.bin", "tree.bin", "back.txt")]
+            with open(paths[0], 'w') as f:
+                f.write(text)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                Logic.compress_file(paths[0], paths[1], paths[2], packed=True, canonical=True, binary_rle=True)
+            written = (os.path.getsize(paths[1]) + os.path.getsize(paths[2])) * 8
+            self.assertIn(f"Compressed Size (bits): {written}\n", output.getvalue())
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                Logic.decompress_file(paths[1], paths[2], paths[3], canonical=True, binary_rle=True)
+            with open(paths[3]) as f:
+                self.assertEqual(f.read(), text)
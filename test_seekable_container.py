@@ -0,0 +1,61 @@
+import io
+import os
+import tempfile
+import unittest
+import Logic
+
+class TestSeekableContainer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write_container(self, data, block_size, mode='text'):
+        path = os.path.join(self.tmp.name, "archive.bin")
+        src = io.BytesIO(data) if mode == 'bytes' else io.StringIO(data)
+        with open(path, 'wb') as dst:
+            Logic.compress_stream(src, dst, block_size, mode=mode, index=True)
+        return path
+
+    def test_ranges_match_slices(self):
+        """Test ranges inside one block, across blocks and past the end."""
+        text = "".join(f"record {i:05d}: {'é' * (i % 4)}\n" for i in range(400))
+        path = self.write_container(text, block_size=512)
+        for start, length in [(0, 10), (500, 30), (1000, 2000), (len(text) - 5, 50), (len(text) + 10, 5)]:
+            self.assertEqual(Logic.read_range(path, start, length), text[start:start + length])
+
+    def test_only_touched_blocks_are_decoded(self):
+        """Test that a range decodes just the blocks it overlaps."""
+        text = "abcdefghij" * 1000
+        path = self.write_container(text, block_size=1000)
+        decoded = []
+        original = Logic.decompress_block
+        Logic.decompress_block = lambda *args: decoded.append(1) or original(*args)
+        try:
+            self.assertEqual(Logic.read_range(path, 4990, 20), text[4990:5010])
+        finally:
+            Logic.decompress_block = original
+        self.assertEqual(len(decoded), 2)
+
+    def test_bytes_container_range(self):
+        """Test a range over a byte container."""
+        data = bytes(range(256)) * 40
+        path = self.write_container(data, block_size=1000, mode='bytes')
+        self.assertEqual(Logic.read_range(path, 2500, 1200), data[2500:3700])
+
+    def test_indexed_container_still_streams(self):
+        """Test that decompress_stream reads a seekable container in full."""
+        text = "seekable containers stay readable\n" * 100
+        path = self.write_container(text, block_size=300)
+        decompressed = io.StringIO()
+        with open(path, 'rb') as src:
+            Logic.decompress_stream(src, decompressed)
+        self.assertEqual(decompressed.getvalue(), text)
+
+    def test_error_case_no_index(self):
+        """Test that a container written without an index is rejected."""
+        path = os.path.join(self.tmp.name, "plain.bin")
+        with open(path, 'wb') as dst:
+            Logic.compress_stream(io.StringIO("no index here"), dst, 4)
+        with self.assertRaises(ValueError):
+            Logic.read_range(path, 0, 5)
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+import Logic
+import service
+
+async def request(port, method, path, body=b''):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+class TestCompressionService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = await service.CompressionService(port=0, workers=2, batch_delay=0.02).start()
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def test_round_trip_text(self):
+        """Test compressing and decompressing text over HTTP."""
+        text = "compression as a service\n" * 200
+        status, compressed = await request(self.service.port, 'POST', '/compress', text.encode('utf-8'))
+        self.assertEqual(status, 200)
+        self.assertTrue(compressed.startswith(Logic.CONTAINER_MAGIC))
+        status, decompressed = await request(self.service.port, 'POST', '/decompress', compressed)
+        self.assertEqual((status, decompressed.decode('utf-8')), (200, text))
+
+    async def test_round_trip_bytes_mode(self):
+        """Test the bytes mode query parameter."""
+        data = bytes(range(256)) * 4
+        status, compressed = await request(self.service.port, 'POST', '/compress?mode=bytes', data)
+        self.assertTrue(compressed.startswith(Logic.BYTES_CONTAINER_MAGIC))
+        status, decompressed = await request(self.service.port, 'POST', '/decompress', compressed)
+        self.assertEqual((status, decompressed), (200, data))
+
+    async def test_small_requests_are_batched(self):
+        """Test that concurrent small requests share pool tasks."""
+        messages = [f"message {i}".encode('utf-8') for i in range(20)]
+        results = await asyncio.gather(*(request(self.service.port, 'POST', '/compress', m) for m in messages))
+        self.assertTrue(all(status == 200 for status, _ in results))
+        self.assertLess(self.service.batches, len(messages))
+        for message, (_, compressed) in zip(messages, results):
+            self.assertEqual(service.decompress_payload(compressed), message)
+
+    async def test_large_request_skips_batching(self):
+        """Test that a request above the batching threshold goes straight to the pool."""
+        self.service.small_request = 10
+        status, compressed = await request(self.service.port, 'POST', '/compress', b"a" * 1000)
+        self.assertEqual(status, 200)
+        self.assertEqual(self.service.batches, 0)
+
+    async def test_backpressure_rejects_when_full(self):
+        """Test that requests waiting on a saturated max_concurrency are capped by max_pending."""
+        self.service.slots = asyncio.Semaphore(1)
+        self.service.max_pending = 2
+        await self.service.slots.acquire()  # Saturate max_concurrency
+        waiting = [asyncio.create_task(request(self.service.port, 'POST', '/compress', b"abc")) for _ in range(2)]
+        while self.service.pending < 2:
+            await asyncio.sleep(0.01)
+        status, _ = await request(self.service.port, 'POST', '/compress', b"abc")
+        self.assertEqual(status, 503)
+        self.service.slots.release()
+        self.assertEqual([status for status, _ in await asyncio.gather(*waiting)], [200, 200])
+        self.assertEqual(self.service.pending, 0)
+
+    async def test_error_cases(self):
+        """Test a corrupt container, an unknown path and a wrong method."""
+        self.assertEqual((await request(self.service.port, 'POST', '/decompress', b"garbage"))[0], 400)
+        self.assertEqual((await request(self.service.port, 'POST', '/nope', b""))[0], 404)
+        self.assertEqual((await request(self.service.port, 'GET', '/compress'))[0], 405)
+        self.assertEqual(await request(self.service.port, 'GET', '/health'), (200, b"ok"))
+
+    async def test_malformed_body_does_not_fail_its_batch(self):
+        """Test that a body failing with a non-ValueError error gets a 400 and leaves its batch intact."""
+        body = Logic.write_codebook_header({'a': 1, 'b': 1}) + b"\xff" * 11 + b"\x01"  # 12-byte varint run
+        corrupt = (Logic.CONTAINER_MAGIC + Logic.BLOCK_HEADER.pack(Logic.BLOCK_HUFFMAN_RLE, len(body)) + body
+                   + Logic.BLOCK_HEADER.pack(Logic.BLOCK_END, 0))
+        (bad_status, _), (good_status, compressed) = await asyncio.gather(
+            request(self.service.port, 'POST', '/decompress', corrupt),
+            request(self.service.port, 'POST', '/compress', b"hello world"))
+        self.assertEqual((bad_status, good_status), (400, 200))
+        self.assertEqual(self.service.batches, 1)
+        self.assertEqual(service.decompress_payload(compressed), b"hello world")
+
+    async def test_failed_pool_answers_500(self):
+        """Test that a pool that can no longer run jobs gives 500 instead of a dropped connection."""
+        self.service.pool.shutdown()
+        self.assertEqual((await request(self.service.port, 'POST', '/compress', b"abc"))[0], 500)
+        self.service.small_request = 0
+        self.assertEqual((await request(self.service.port, 'POST', '/compress', b"abc"))[0], 500)
@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+import Logic
+
+SAMPLES = ["user logged in from 10.0.0.1", "user logged out", "order 1234 shipped to warehouse 7",
+           "payment accepted for order 98"]
+
+class TestSharedCodebook(unittest.TestCase):
+
+    def setUp(self):
+        self.codebook = Logic.train_codebook(SAMPLES)
+
+    def test_round_trip_seen_symbols(self):
+        """Test a short message made of trained symbols."""
+        message = "user 1234 logged in, order 98 shipped to warehouse 7"
+        data = Logic.compress_message(message, self.codebook)
+        self.assertEqual(Logic.decompress_message(data, self.codebook), message)
+        self.assertLess(len(data), len(message))
+
+    def test_round_trip_unseen_symbols(self):
+        """Test that unseen characters, including the escape itself, survive via the escape."""
+        message = "user Zoë paid €5 " + self.codebook.escape + "!"
+        data = Logic.compress_message(message, self.codebook)
+        self.assertEqual(Logic.decompress_message(data, self.codebook), message)
+
+    def test_edge_case_empty_message(self):
+        """Test compressing an empty message."""
+        data = Logic.compress_message("", self.codebook)
+        self.assertEqual(Logic.decompress_message(data, self.codebook), "")
+
+    def test_bytes_codebook_covers_every_byte(self):
+        """Test a byte codebook on bytes it never saw in training."""
+        codebook = Logic.train_codebook([b"aaab", b"abba"], byte_symbols=True)
+        message = bytes(range(256))
+        data = Logic.compress_message(message, codebook)
+        self.assertEqual(Logic.decompress_message(data, codebook), message)
+
+    def test_save_and_load_by_id(self):
+        """Test that a saved codebook loads back under its ID and decodes old messages."""
+        data = Logic.compress_message("user 7 shipped", self.codebook)
+        with tempfile.TemporaryDirectory() as tmp:
+            codebook_id = Logic.save_codebook(self.codebook, tmp)
+            loaded = Logic.load_codebook(codebook_id, tmp)
+        self.assertEqual(loaded.codebook_id, self.codebook.codebook_id)
+        self.assertEqual(Logic.decompress_message(data, {loaded.codebook_id: loaded}), "user 7 shipped")
+
+    def test_error_case_unknown_codebook(self):
+        """Test that a message for a different codebook is rejected."""
+        data = Logic.compress_message("user", self.codebook)
+        other = Logic.train_codebook(["something else entirely"])
+        with self.assertRaises(ValueError):
+            Logic.decompress_message(data, other)
+
+    def test_error_case_truncated_message(self):
+        """Test that a message cut off in its payload is rejected."""
+        data = Logic.compress_message("payment accepted", self.codebook)
+        with self.assertRaises(ValueError):
+            Logic.decompress_message(data[:-3], self.codebook)
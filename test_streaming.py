@@ -0,0 +1,106 @@
+import io
+import os
+import tempfile
+import unittest
+import Logic
+
+class TestStreamingCompression(unittest.TestCase):
+
+    def round_trip(self, text, block_size):
+        compressed = io.BytesIO()
+        Logic.compress_stream(io.StringIO(text), compressed, block_size)
+        decompressed = io.StringIO()
+        Logic.decompress_stream(io.BytesIO(compressed.getvalue()), decompressed)
+        return compressed.getvalue(), decompressed.getvalue()
+
+    def test_normal_case_many_blocks(self):
+        """Test a streaming round trip where the input spans many blocks."""
+        text = "2024-01-01 INFO request served in 12ms\n" * 200
+        compressed, decompressed = self.round_trip(text, block_size=256)
+        self.assertEqual(decompressed, text)
+        self.assertTrue(compressed.startswith(Logic.CONTAINER_MAGIC))
+
+    def test_normal_case_blocks_have_own_codebooks(self):
+        """Test blocks whose alphabets differ completely."""
+        text = "a" * 100 + "xyz" * 100 + "a" * 100
+        _, decompressed = self.round_trip(text, block_size=100)
+        self.assertEqual(decompressed, text)
+
+    def test_edge_case_empty_input(self):
+        """Test streaming an empty input."""
+        compressed, decompressed = self.round_trip("", block_size=16)
+        self.assertEqual(decompressed, "")
+        self.assertEqual(compressed, Logic.CONTAINER_MAGIC + Logic.BLOCK_HEADER.pack(Logic.BLOCK_END, 0))
+
+    def test_error_case_truncated_container(self):
+        """Test that a container cut off mid-block is rejected."""
+        compressed, _ = self.round_trip("hello world" * 20, block_size=50)
+        with self.assertRaises(ValueError):
+            Logic.decompress_stream(io.BytesIO(compressed[:-20]), io.StringIO())
+
+    def test_error_case_not_a_container(self):
+        """Test that data without the container magic is rejected."""
+        with self.assertRaises(ValueError):
+            Logic.decompress_stream(io.BytesIO(b"3:0,4:1"), io.StringIO())
+
+    def test_compress_decompress_file_streaming(self):
+        """Test the streaming compress_file/decompress_file round trip on disk."""
+        text = "DAA Project\nData Compression\n" * 100
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ("in.txt", "out.bin", "back.txt")]
+            with open(paths[0], 'w') as f:
+                f.write(text)
+            Logic.compress_file(paths[0], paths[1], None, streaming=True, block_size=500)
+            Logic.decompress_file(paths[1], None, paths[2], streaming=True)
+            with open(paths[2]) as f:
+                self.assertEqual(f.read(), text)
+
+    def test_parallel_matches_serial(self):
+        """Test that a worker pool writes the same container as a single process."""
+        text = "".join(f"line {i}: {'abc' * (i % 7)}\n" for i in range(500))
+        serial = io.BytesIO()
+        Logic.compress_stream(io.StringIO(text), serial, block_size=700)
+        parallel = io.BytesIO()
+        Logic.compress_stream(io.StringIO(text), parallel, block_size=700, workers=2)
+        self.assertEqual(parallel.getvalue(), serial.getvalue())
+
+        decompressed = io.StringIO()
+        Logic.decompress_stream(io.BytesIO(parallel.getvalue()), decompressed, workers=2)
+        self.assertEqual(decompressed.getvalue(), text)
+
+    def test_adaptive_block_types(self):
+        """Test that each block keeps the smallest of raw, Huffman and Huffman+RLE."""
+        cases = [("a" * 4000 + "b" * 4000, Logic.BLOCK_HUFFMAN_RLE),
+                 ("the quick brown fox jumps over the lazy dog " * 20, Logic.BLOCK_HUFFMAN),
+                 ("Zq7!", Logic.BLOCK_RAW)]
+        for text, expected_type in cases:
+            block = Logic.compress_block(text)
+            block_type, body = Logic.read_block(io.BytesIO(block))
+            self.assertEqual(block_type, expected_type)
+            self.assertEqual(Logic.decompress_block(block_type, body), text)
+
+    def test_non_adaptive_block_is_huffman(self):
+        """Test that adaptive=False always writes a Huffman block."""
+        block = Logic.compress_block("Zq7!", adaptive=False)
+        self.assertEqual(Logic.read_block(io.BytesIO(block))[0], Logic.BLOCK_HUFFMAN)
+
+    def test_error_case_unknown_block_type(self):
+        """Test that an unknown block type is rejected."""
+        with self.assertRaises(ValueError):
+            Logic.decompress_block(99, b"")
+
+    def test_progress_reports_every_block(self):
+        """Test that the progress callback sees the running total after each block."""
+        done = []
+        Logic.compress_stream(io.StringIO("x" * 1000), io.BytesIO(), block_size=300, progress=done.append)
+        self.assertEqual(done, [300, 600, 900, 1000])
+
+    def test_progress_can_cancel(self):
+        """Test that raising CompressionCancelled from the callback stops compression."""
+        def progress(done):
+            if done >= 200:
+                raise Logic.CompressionCancelled()
+        compressed = io.BytesIO()
+        with self.assertRaises(Logic.CompressionCancelled):
+            Logic.compress_stream(io.StringIO("y" * 1000), compressed, block_size=100, progress=progress)
+        self.assertFalse(compressed.getvalue().endswith(Logic.BLOCK_HEADER.pack(Logic.BLOCK_END, 0)))
@@ -0,0 +1,45 @@
+import unittest
+import Logic
+
+class TestHuffmanTreeView(unittest.TestCase):
+
+    def codes(self, text):
+        return Logic.generate_huffman_codes(Logic.build_huffman_tree(text))
+
+    def test_small_tree_is_shown_in_full(self):
+        """Test that a small codebook is drawn without collapsing anything."""
+        huffman_codes = self.codes("abracadabra")
+        view = Logic.huffman_tree_view(huffman_codes)
+        self.assertEqual({view[code] for code in huffman_codes.values()}, set("abrcd"))
+        self.assertEqual(len(view), 2 * len(huffman_codes) - 1)
+
+    def test_large_tree_is_capped(self):
+        """Test that thousands of symbols collapse into at most max_nodes nodes."""
+        text = "ab" * 5000 + "".join(chr(0x4E00 + i) * (i % 5 + 1) for i in range(3000))
+        huffman_codes = self.codes(text)
+        view = Logic.huffman_tree_view(huffman_codes, max_nodes=31)
+        self.assertLessEqual(len(view), 31)
+        self.assertIn('a', view.values())
+        # Every node hangs off a node in the view, and collapsed nodes account for every symbol
+        self.assertTrue(all(prefix[:-1] in view for prefix in view if prefix))
+        shown = sum(int(label.split()[0]) if label.endswith("symbols") else 1
+                    for prefix, label in view.items() if label)
+        self.assertEqual(shown, len(huffman_codes))
+
+    def test_min_weight_and_depth_collapse(self):
+        """Test collapsing by weight and by depth."""
+        huffman_codes = {'a': '0', 'b': '10', 'c': '110', 'd': '111'}
+        self.assertEqual(Logic.huffman_tree_view(huffman_codes, min_weight=0.3),
+                         {'': '', '0': 'a', '1': '', '10': 'b', '11': '2 symbols'})
+        self.assertEqual(Logic.huffman_tree_view(huffman_codes, max_depth=1), {'': '', '0': 'a', '1': '3 symbols'})
+
+    def test_labels_and_positions(self):
+        """Test byte and whitespace labels and the node layout."""
+        self.assertEqual(Logic.tree_view_label(65), 'A')
+        self.assertEqual(Logic.tree_view_label(10), '0x0a')
+        self.assertEqual(Logic.tree_view_label(' '), "' '")
+        self.assertEqual(Logic.tree_view_position('01'), (-0.25, -2))
+
+    def test_edge_case_empty_codebook(self):
+        """Test the view of an empty codebook."""
+        self.assertEqual(Logic.huffman_tree_view({}), {})
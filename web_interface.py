@@ -2,13 +2,18 @@ import streamlit as st
 import time
 import heapq
 from collections import Counter
-import math
 import matplotlib.pyplot as plt
 import networkx as nx
+import io
 import os
+from Logic import (Codebook, CompressionStats, ResultCache, huffman_tree_view, tree_view_position,
+                   huffman_encode_packed, huffman_decode_packed, build_decode_table, huffman_decode_table,
+                   rle_compress_binary, rle_decompress_binary)
 
 # Define the Huffman Node class
 class HuffmanNode:
+    __slots__ = ('char', 'freq', 'left', 'right')
+
     def __init__(self, char, freq):
         self.char = char
         self.freq = freq
@@ -34,9 +39,11 @@ def build_huffman_tree(text):
 
     return heap[0]
 
-def generate_huffman_codes(root, code='', huffman_codes={}):
+def generate_huffman_codes(root, code='', huffman_codes=None):
+    if huffman_codes is None:
+        huffman_codes = {}
     if root is None:
-        return
+        return huffman_codes
     if root.char is not None:
         huffman_codes[root.char] = code
     generate_huffman_codes(root.left, code + '0', huffman_codes)
@@ -97,20 +104,36 @@ def huffman_decode(encoded_text, huffman_tree):
             current_node = huffman_tree
     return ''.join(decoded_text)
 
-def compress_text(text):
+def compress_text(text, packed=False, binary_rle=False, stats=None):
+    if stats is None:
+        stats = CompressionStats()
     start_time = time.time()
 
     # Huffman Encoding
-    root = build_huffman_tree(text)
-    huffman_codes = generate_huffman_codes(root)
-    encoded_text = huffman_encode(text, huffman_codes)
+    with stats.stage('build_huffman_tree', len(text)):
+        root = build_huffman_tree(text)
+        huffman_codes = generate_huffman_codes(root)
+
+    original_size = len(text) * 8  # Original in bits
+    with stats.stage('huffman_encode', len(text)) as record:
+        if packed:
+            encoded = huffman_encode_packed(text, Codebook(huffman_codes))
+        else:
+            encoded = huffman_encode(text, huffman_codes)
+        record['bytes_out'] = len(encoded)
 
     # Run-Length Encoding
-    compressed_data = rle_compress(encoded_text)
+    with stats.stage('rle_compress', len(encoded)) as record:
+        if binary_rle:
+            compressed_data = rle_compress_binary(encoded)
+        elif packed:
+            compressed_data = encoded
+        else:
+            compressed_data = rle_compress(encoded)
+        record['bytes_out'] = len(compressed_data)
 
-    original_size = len(text) * 8  # Original in bits
-    rle_pairs = compressed_data.split(',')
-    compressed_size = sum(math.ceil(math.log2(int(pair.split(':')[0]) + 1)) + 1 for pair in rle_pairs)
+    # Exact size of the compressed data in bits
+    compressed_size = len(compressed_data) * 8
 
     compression_ratio = (original_size - compressed_size) / original_size * 100
     end_time = time.time()
@@ -119,17 +142,27 @@ def compress_text(text):
 
     return compressed_data, huffman_codes, root, compression_ratio, original_size, compressed_size, compression_time
 
-def decompress_text(compressed_data, huffman_codes):
+def decompress_text(compressed_data, huffman_codes, packed=False, engine='table', binary_rle=False):
     start_time = time.time()
 
-    # Rebuild Huffman Tree
-    huffman_tree = rebuild_huffman_tree(huffman_codes)
-
     # Decode RLE
-    binary_string = rle_decompress(compressed_data)
+    if binary_rle:
+        encoded = rle_decompress_binary(compressed_data)
+    elif packed:
+        encoded = compressed_data
+    else:
+        encoded = rle_decompress(compressed_data)
 
     # Decode Huffman
-    original_text = huffman_decode(binary_string, huffman_tree)
+    if engine == 'table':
+        original_text = huffman_decode_table(encoded, build_decode_table(huffman_codes))
+    else:
+        # Rebuild Huffman Tree
+        huffman_tree = rebuild_huffman_tree(huffman_codes)
+        if isinstance(encoded, str):
+            original_text = huffman_decode(encoded, huffman_tree)
+        else:
+            original_text = huffman_decode_packed(encoded, huffman_tree)
 
     end_time = time.time()
     return original_text, end_time - start_time
@@ -158,41 +191,57 @@ def plot_compression_stats(original_size, compressed_size, compression_ratio):
     st.pyplot(fig)
 
 # Huffman Tree Visualization
-def add_edges(graph, node, pos, x=0, y=0, layer=1, parent=None):
-    if node is not None:
-        pos[node] = (x, -y)
-        if parent:
-            graph.add_edge(parent, node)
-
-        next_y = y + 1
-        next_x = 2 ** (-layer)
-        add_edges(graph, node.left, pos, x - next_x, next_y, layer + 1, node)
-        add_edges(graph, node.right, pos, x + next_x, next_y, layer + 1, node)
-
-def visualize_huffman_tree(root):
+# Draws a capped view of the codebook (see Logic.huffman_tree_view) and returns it as PNG bytes
+def render_huffman_tree(huffman_codes):
+    view = huffman_tree_view(huffman_codes)
     graph = nx.DiGraph()
-    pos = {}
-
-    add_edges(graph, root, pos)
+    graph.add_nodes_from(view)
+    graph.add_edges_from((prefix[:-1], prefix) for prefix in view if prefix)
+    pos = {prefix: tree_view_position(prefix) for prefix in view}
 
-    labels = {node: node.char if node.char else '' for node in pos}
-
-    plt.figure(figsize=(12, 8))
-    nx.draw(graph, pos, labels=labels, with_labels=True, node_size=500, node_color="black", font_color="white")
+    fig = plt.figure(figsize=(12, 8))
+    nx.draw(graph, pos, labels=view, with_labels=True, node_size=500, node_color="black", font_color="white")
     plt.title("Huffman Tree Visualization")
-    st.pyplot(plt)
-
+    image = io.BytesIO()
+    fig.savefig(image, format='png')
+    plt.close(fig)
+    return image.getvalue()
+
+# Rendered images are cached per codebook, so repeated views skip networkx and matplotlib
+def visualize_huffman_tree(huffman_codes):
+    key = ResultCache.key(repr(sorted(huffman_codes.items())), 'tree_view')
+    st.image(result_cache().get_or_compute(key, lambda: render_huffman_tree(huffman_codes)))
+
+
+# Result Cache
+# One cache for every session, so re-runs and repeated uploads of the same file skip the pipeline.
+# Set DAA_CACHE_DIR to spill evicted results to disk instead of dropping them.
+@st.cache_resource
+def result_cache():
+    return ResultCache(spill_dir=os.environ.get('DAA_CACHE_DIR'))
+
+# The tree is not cached: the codebook determines it and the tree view is drawn from it
+def cached_compress_text(text):
+    def compute():
+        stats = CompressionStats()
+        compressed_data, huffman_codes, _, *sizes = compress_text(text, stats=stats)
+        return (compressed_data, huffman_codes, *sizes, stats.as_rows())
+    return result_cache().get_or_compute(ResultCache.key(text, 'compress_text'), compute)
 
 # Streamlit GUI
 st.title("Data Compression Tool")
 
-uploaded_file = st.file_uploader("Upload a text file for compression", type=["txt"])
+# Number of bytes decoded for the on-screen preview
+PREVIEW_BYTES = 10000
+
+uploaded_file = st.file_uploader("Upload a file for compression")
 if uploaded_file is not None:
-    text = uploaded_file.read().decode("utf-8")
-    st.text_area("Original Text", text, height=200)
+    # Compress the raw bytes (256-symbol alphabet); only the preview is decoded
+    text = uploaded_file.getvalue()
+    st.text_area("Original Text", text[:PREVIEW_BYTES].decode("utf-8", errors="replace"), height=200)
 
     if st.button("Compress"):
-        compressed_data, huffman_codes, root, compression_ratio, original_size, compressed_size, compression_time = compress_text(text)
+        compressed_data, huffman_codes, compression_ratio, original_size, compressed_size, compression_time, stats_rows = cached_compress_text(text)
 
         st.success("Compression Complete")
         st.text_area("Compressed Data", compressed_data, height=200)
@@ -202,11 +251,12 @@ if uploaded_file is not None:
         st.write(f"**Compressed Size (bits):** {compressed_size}")
         st.write(f"**Compression Ratio:** {compression_ratio:.2f}%")
         st.write(f"**Compression Time:** {compression_time:.8f} seconds")
+        st.table(stats_rows)
 
         plot_compression_stats(original_size, compressed_size, compression_ratio)
 
         st.write("### Huffman Tree Visualization")
-        visualize_huffman_tree(root)
+        visualize_huffman_tree(huffman_codes)
 
         # Save button now directly uses Streamlit's download_button
         st.download_button(
@@ -218,7 +268,8 @@ if uploaded_file is not None:
 
         if st.button("Decompress"):
             decompressed_text, decompression_time = decompress_text(compressed_data, huffman_codes)
-            st.text_area("Decompressed Text", decompressed_text, height=200)
+            st.text_area("Decompressed Text", decompressed_text[:PREVIEW_BYTES].decode("utf-8", errors="replace"),
+                         height=200)
             st.write(f"Decompression Time: {decompression_time:.2f} seconds")
 
 
@@ -2,13 +2,17 @@ import streamlit as st
 import time
 import heapq
 from collections import Counter
-import math
 import matplotlib.pyplot as plt
 import networkx as nx
+import io
 import os
+from Logic import (Codebook, CompressionStats, ResultCache, huffman_tree_view, tree_view_position,
+                   huffman_encode_packed, unpack_bits, rle_compress_binary)
 
 # Define the Huffman Node class
 class HuffmanNode:
+    __slots__ = ('char', 'freq', 'left', 'right')
+
     def __init__(self, char, freq):
         self.char = char
         self.freq = freq
@@ -34,9 +38,11 @@ def build_huffman_tree(text):
 
     return heap[0]
 
-def generate_huffman_codes(root, code='', huffman_codes={}):
+def generate_huffman_codes(root, code='', huffman_codes=None):
+    if huffman_codes is None:
+        huffman_codes = {}
     if root is None:
-        return
+        return huffman_codes
     if root.char is not None:
         huffman_codes[root.char] = code
     generate_huffman_codes(root.left, code + '0', huffman_codes)
@@ -96,81 +102,110 @@ def huffman_decode(encoded_text, huffman_tree):
             current_node = huffman_tree
     return ''.join(decoded_text)
 
-def compress_text(text):
+def compress_text(text, packed=False, stats=None):
+    if stats is None:
+        stats = CompressionStats()
     start_time = time.time()
 
     # Huffman Encoding
-    root = build_huffman_tree(text)
-    huffman_codes = generate_huffman_codes(root)
-    encoded_text = huffman_encode(text, huffman_codes)
+    with stats.stage('build_huffman_tree', len(text)):
+        root = build_huffman_tree(text)
+        huffman_codes = generate_huffman_codes(root)
 
     original_size = len(text) * 8  # Original in bits
-    compressed_size_huffman = len(encoded_text)  # Size after Huffman in bits
+    with stats.stage('huffman_encode', len(text)) as record:
+        if packed:
+            encoded_text = huffman_encode_packed(text, Codebook(huffman_codes))
+            compressed_size_huffman = len(encoded_text) * 8  # Packed bytes incl. trailer
+        else:
+            encoded_text = huffman_encode(text, huffman_codes)
+            compressed_size_huffman = len(encoded_text)  # Size after Huffman in bits
+        record['bytes_out'] = compressed_size_huffman // 8
 
     compression_ratio_huffman = (original_size - compressed_size_huffman) / original_size * 100
     end_time = time.time()
 
     return encoded_text, huffman_codes, root, compression_ratio_huffman, original_size, compressed_size_huffman, end_time - start_time
 
-def apply_rle_to_huffman(encoded_text):
-    compressed_data = rle_compress(encoded_text)
+def apply_rle_to_huffman(encoded_text, binary_rle=False, stats=None):
+    if stats is None:
+        stats = CompressionStats()
+    with stats.stage('rle_compress', len(encoded_text)) as record:
+        if binary_rle:
+            compressed_data = rle_compress_binary(encoded_text)
+        else:
+            if isinstance(encoded_text, (bytes, bytearray)):
+                encoded_text = unpack_bits(encoded_text)
+            compressed_data = rle_compress(encoded_text)
+        record['bytes_out'] = len(compressed_data)
 
-    rle_pairs = compressed_data.split(',')
-    compressed_size_rle = sum(math.ceil(math.log2(int(pair.split(':')[0]) + 1)) + 1 for pair in rle_pairs)
+    # Exact size of the RLE output in bits
+    compressed_size_rle = len(compressed_data) * 8
 
     return compressed_data, compressed_size_rle
 
-def visualize_huffman_tree(root):
-    def add_edges(graph, node, pos, x=0, y=0, layer=1, parent=None):
-        if node is not None:
-            pos[node] = (x, -y)
-            if parent:
-                graph.add_edge(parent, node)
-
-            next_y = y + 1
-            next_x = 2 ** (-layer)
-            add_edges(graph, node.left, pos, x - next_x, next_y, layer + 1, node)
-            add_edges(graph, node.right, pos, x + next_x, next_y, layer + 1, node)
-
+# Huffman Tree Visualization
+# Draws a capped view of the codebook (see Logic.huffman_tree_view) and returns it as PNG bytes
+def render_huffman_tree(huffman_codes):
+    view = huffman_tree_view(huffman_codes)
     graph = nx.DiGraph()
-    pos = {}
+    graph.add_nodes_from(view)
+    graph.add_edges_from((prefix[:-1], prefix) for prefix in view if prefix)
+    pos = {prefix: tree_view_position(prefix) for prefix in view}
 
-    add_edges(graph, root, pos)
-
-    labels = {node: node.char if node.char else '' for node in pos}
-
-    plt.figure(figsize=(12, 8))
-    nx.draw(graph, pos, labels=labels, with_labels=True, node_size=500, node_color="black", font_color="white")
+    fig = plt.figure(figsize=(12, 8))
+    nx.draw(graph, pos, labels=view, with_labels=True, node_size=500, node_color="black", font_color="white")
     plt.title("Huffman Tree Visualization")
-    st.pyplot(plt)
+    image = io.BytesIO()
+    fig.savefig(image, format='png')
+    plt.close(fig)
+    return image.getvalue()
+
+# Rendered images are cached per codebook, so repeated views skip networkx and matplotlib
+def visualize_huffman_tree(huffman_codes):
+    key = ResultCache.key(repr(sorted(huffman_codes.items())), 'tree_view')
+    st.image(result_cache().get_or_compute(key, lambda: render_huffman_tree(huffman_codes)))
+
+# Result Cache
+# One cache for every session: session_state holds only the cache keys, so per-user
+# memory stays constant and repeated uploads of the same file skip the pipeline.
+# Set DAA_CACHE_DIR to spill evicted results to disk instead of dropping them.
+@st.cache_resource
+def result_cache():
+    return ResultCache(spill_dir=os.environ.get('DAA_CACHE_DIR'))
+
+# The tree is not cached: the codebook determines it and the tree view is drawn from it
+def cached_huffman(text):
+    def compute():
+        stats = CompressionStats()
+        encoded_text, huffman_codes, _, *sizes = compress_text(text, stats=stats)
+        return (encoded_text, huffman_codes, *sizes, stats.as_rows())
+    key = ResultCache.key(text, 'huffman')
+    return key, result_cache().get_or_compute(key, compute)
+
+def cached_rle(huffman_key, encoded_text):
+    def compute():
+        stats = CompressionStats()
+        return (*apply_rle_to_huffman(encoded_text, stats=stats), stats.as_rows())
+    return result_cache().get_or_compute(ResultCache.key(huffman_key, 'rle'), compute)
 
 # Streamlit GUI
 st.title("Data Compression Tool")
 
-uploaded_file = st.file_uploader("Upload a text file for compression", type=["txt"])
-huffman_encoded_text = st.session_state.get('huffman_encoded_text', None)
-huffman_codes = st.session_state.get('huffman_codes', None)
-huffman_tree = st.session_state.get('huffman_tree', None)
-rle_compressed_data = st.session_state.get('rle_compressed_data', None)
-original_size = st.session_state.get('original_size', 0)
-compressed_size_huffman = st.session_state.get('compressed_size_huffman', 0)
-compressed_size_rle = st.session_state.get('compressed_size_rle', 0)
-compression_ratio_huffman = st.session_state.get('compression_ratio_huffman', 0)
-compression_ratio_rle = st.session_state.get('compression_ratio_rle', 0)
+# Number of bytes decoded for the on-screen preview
+PREVIEW_BYTES = 10000
+
+uploaded_file = st.file_uploader("Upload a file for compression")
 
 if uploaded_file is not None:
-    text = uploaded_file.read().decode("utf-8")
-    st.text_area("Original Text", text, height=200)
+    # Compress the raw bytes (256-symbol alphabet); only the preview is decoded
+    text = uploaded_file.getvalue()
+    st.text_area("Original Text", text[:PREVIEW_BYTES].decode("utf-8", errors="replace"), height=200)
 
     if st.button("Apply Huffman Coding"):
-        huffman_encoded_text, huffman_codes, huffman_tree, compression_ratio_huffman, original_size, compressed_size_huffman, compression_time = compress_text(text)
-
-        st.session_state['huffman_encoded_text'] = huffman_encoded_text
-        st.session_state['huffman_codes'] = huffman_codes
-        st.session_state['huffman_tree'] = huffman_tree
-        st.session_state['compression_ratio_huffman'] = compression_ratio_huffman
-        st.session_state['original_size'] = original_size
-        st.session_state['compressed_size_huffman'] = compressed_size_huffman
+        huffman_key, (huffman_encoded_text, huffman_codes, compression_ratio_huffman, original_size,
+                      compressed_size_huffman, compression_time, stats_rows) = cached_huffman(text)
+        st.session_state['huffman_key'] = huffman_key
 
         st.success("Huffman Coding Applied")
         st.text_area("Huffman Binary Output", huffman_encoded_text, height=200, key="huffman_output")
@@ -178,26 +213,30 @@ if uploaded_file is not None:
         st.write(f"Huffman Compression Ratio: {compression_ratio_huffman:.2f}%")
         st.write(f"Original Size: {original_size} bits")
         st.write(f"Compressed Size (Huffman): {compressed_size_huffman} bits")
+        st.table(stats_rows)
 
-    if huffman_tree and st.button("Show Huffman Tree"):
-        visualize_huffman_tree(huffman_tree)
+    # Later steps re-read the Huffman result from the cache (recomputed if it was evicted)
+    if 'huffman_key' in st.session_state:
+        huffman_key, (huffman_encoded_text, huffman_codes, compression_ratio_huffman, original_size,
+                      compressed_size_huffman, compression_time, _) = cached_huffman(text)
 
-    if huffman_encoded_text and st.button("Apply RLE"):
-        rle_compressed_data, compressed_size_rle = apply_rle_to_huffman(huffman_encoded_text)
+        if st.button("Show Huffman Tree"):
+            visualize_huffman_tree(huffman_codes)
 
-        compression_ratio_rle = (original_size - compressed_size_rle) / original_size * 100
+        if st.button("Apply RLE"):
+            rle_compressed_data, compressed_size_rle, stats_rows = cached_rle(huffman_key, huffman_encoded_text)
 
-        st.session_state['rle_compressed_data'] = rle_compressed_data
-        st.session_state['compressed_size_rle'] = compressed_size_rle
-        st.session_state['compression_ratio_rle'] = compression_ratio_rle
+            compression_ratio_rle = (original_size - compressed_size_rle) / original_size * 100
 
-        st.success("RLE Compression Applied")
-        st.text_area("RLE Compressed Data", rle_compressed_data, height=200, key="rle_output")
+            st.success("RLE Compression Applied")
+            st.text_area("RLE Compressed Data", rle_compressed_data, height=200, key="rle_output")
 
-        st.write(f"RLE Compression Ratio: {compression_ratio_rle:.2f}%")
-        st.write(f"Compressed Size (RLE): {compressed_size_rle} bits")
+            st.write(f"RLE Compression Ratio: {compression_ratio_rle:.2f}%")
+            st.write(f"Compressed Size (RLE): {compressed_size_rle} bits")
+            st.table(stats_rows)
 
         if st.button("Save Compressed File"):
+            rle_compressed_data, _, _ = cached_rle(huffman_key, huffman_encoded_text)
             compressed_file = 'compressed_rle.txt'
             with open(compressed_file, 'w') as f:
                 f.write(rle_compressed_data)